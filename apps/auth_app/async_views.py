@@ -0,0 +1,48 @@
+from django.views import View
+from rest_framework import status
+
+from .serializers import LoginSerializer
+from .services import AuthService
+from .cache import token_digest
+from .decorators import alogin_required, ahashing_backpressure
+from .responses import json_response, parse_json
+from apps.users.serializers import user_data
+
+
+class LoginAsyncView(View):
+    """Вход в систему (ASGI)."""
+
+    @ahashing_backpressure
+    async def post(self, request):
+        data, error = parse_json(request)
+        if error:
+            return error
+        serializer = LoginSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user, token = await AuthService.alogin(
+            email=serializer.validated_data['email'],
+            password=serializer.validated_data['password']
+        )
+
+        if not user:
+            return json_response(
+                {'error': 'Неверный email или пароль'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        return json_response({
+            'token': token,
+            'user': user_data(user)
+        })
+
+
+class LogoutAsyncView(View):
+    """Выход из системы (ASGI)."""
+
+    @alogin_required
+    async def post(self, request):
+        token = request.META.get('HTTP_AUTHORIZATION', '').replace('Bearer ', '')
+        await AuthService.alogout(token_digest(token))
+        return json_response({'message': 'Выход выполнен'})
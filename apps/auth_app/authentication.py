@@ -0,0 +1,14 @@
+from rest_framework.authentication import BaseAuthentication
+
+
+class JWTAuthentication(BaseAuthentication):
+    """
+    Передает в DRF пользователя, установленного JWTAuthMiddleware.
+    Не вычисляет ленивого пользователя и не требует CSRF.
+    """
+
+    def authenticate(self, request):
+        user = getattr(request._request, 'user', None)
+        if user is None:
+            return None
+        return user, None
@@ -0,0 +1,194 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def token_digest(token: str) -> str:
+    """SHA-256 дайджест токена (hex, 64 символа)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    Ограниченный по размеру LRU-кеш с TTL внутри процесса.
+    Ключ - дайджест токена (token_digest), значение - пользователь
+    разрешенной сессии.
+
+    Запись живет не дольше TTL и не дольше expires_at сессии.
+    Изменения из других процессов подхватывает maybe_refresh(): не чаще раза в
+    refresh_interval секунд он догружает сессии, отозванные с прошлой
+    сверки (Session.revoked_at), и пользователей, измененных с нее
+    (User.updated_at), и удаляет только их записи.
+    """
+
+    # Запас на расхождение часов между воркерами
+    CLOCK_SKEW = timedelta(seconds=5)
+
+    def __init__(self, maxsize: int, ttl: int, refresh_interval: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._data = OrderedDict()  # digest -> (user, deadline)
+        self._by_user = {}  # user_id -> set(digest)
+        self._lock = threading.Lock()
+        self._synced_at = None  # timezone.now() прошлой сверки
+        self._refreshed = 0.0   # time.monotonic() прошлой сверки
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: str):
+        """Получить пользователя по дайджесту токена или None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, deadline = entry
+            if deadline <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        # Копия, чтобы изменения в рамках запроса не попадали в кеш
+        return copy.copy(user)
+
+    def set(self, key: str, user, expires_at=None):
+        """Сохранить пользователя для дайджеста токена."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at.timestamp())
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (user, deadline)
+            self._by_user.setdefault(user.id, set()).add(key)
+            while len(self._data) > self.maxsize:
+                old_key = next(iter(self._data))
+                self._remove(old_key)
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        """Удалить запись для дайджеста токена."""
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id):
+        """Удалить все записи пользователя."""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._by_user.clear()
+            # Пустому кешу нечего сверять: окно начнется со следующего вызова
+            self._synced_at = None
+            self._refreshed = 0.0
+
+    def maybe_refresh(self):
+        """Удалить записи сессий и пользователей, измененных в других процессах."""
+        since = self._begin_refresh()
+        if since is None:
+            return
+        try:
+            revoked, updated = self._changed(since)
+            self._drop(list(revoked), list(updated))
+        except Exception:
+            # Окно не потеряно: следующая сверка начнется с того же момента
+            self._synced_at = since + self.CLOCK_SKEW
+            raise
+
+    async def amaybe_refresh(self):
+        """Асинхронная версия maybe_refresh."""
+        since = self._begin_refresh()
+        if since is None:
+            return
+        try:
+            revoked, updated = self._changed(since)
+            self._drop([key async for key in revoked], [user_id async for user_id in updated])
+        except Exception:
+            self._synced_at = since + self.CLOCK_SKEW
+            raise
+
+    def _begin_refresh(self):
+        """
+        Занять очередную сверку. Возвращает начало окна изменений или None,
+        если сверять рано или нечего (кеш пуст).
+        """
+        if time.monotonic() - self._refreshed < self.refresh_interval:
+            return None
+        with self._lock:
+            if time.monotonic() - self._refreshed < self.refresh_interval:
+                return None
+            self._refreshed = time.monotonic()
+            since, self._synced_at = self._synced_at, timezone.now()
+            if since is None or not self._data:
+                return None
+            return since - self.CLOCK_SKEW
+
+    @staticmethod
+    def _changed(since):
+        """(дайджесты отозванных сессий, id измененных пользователей) с момента since."""
+        from apps.users.models import User
+        from .models import Session
+
+        return (
+            Session.objects.filter(revoked_at__gte=since).values_list('token_hash', flat=True),
+            User.objects.filter(updated_at__gte=since).values_list('id', flat=True),
+        )
+
+    def _drop(self, digests, user_ids):
+        with self._lock:
+            for key in digests:
+                if key in self._data:
+                    self._remove(key)
+                    self.invalidations += 1
+            for user_id in user_ids:
+                for key in list(self._by_user.get(user_id, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Счетчики кеша."""
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[0].id
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, 'AUTH_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_CACHE_TTL', 60),
+    refresh_interval=getattr(settings, 'AUTH_CACHE_REFRESH_SECONDS', 1),
+)
@@ -2,12 +2,14 @@ from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
 
+from apps.users.hashing import HasherBusy
+
 
 def login_required(view_method):
     """Декоратор для проверки аутентификации."""
     @wraps(view_method)
     def wrapper(self, request, *args, **kwargs):
-        if not hasattr(request, 'user') or request.user is None:
+        if not getattr(request, 'user', None):
             return Response(
                 {'error': 'Требуется аутентификация'},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -20,7 +22,7 @@ def admin_required(view_method):
     """Декоратор для проверки прав администратора."""
     @wraps(view_method)
     def wrapper(self, request, *args, **kwargs):
-        if not hasattr(request, 'user') or request.user is None:
+        if not getattr(request, 'user', None):
             return Response(
                 {'error': 'Требуется аутентификация'},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -32,3 +34,48 @@ def admin_required(view_method):
             )
         return view_method(self, request, *args, **kwargs)
     return wrapper
+
+
+def hashing_backpressure(view_method):
+    """Декоратор: 503 с Retry-After, если очередь bcrypt переполнена."""
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        try:
+            return view_method(self, request, *args, **kwargs)
+        except HasherBusy as e:
+            return Response(
+                {'error': 'Сервер перегружен, повторите запрос позже'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(e.retry_after)}
+            )
+    return wrapper
+
+
+def alogin_required(view_method):
+    """Асинхронная версия login_required: пользователь загружается через request.auser()."""
+    @wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        from .responses import json_response
+        if not await request.auser():
+            return json_response(
+                {'error': 'Требуется аутентификация'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        return await view_method(self, request, *args, **kwargs)
+    return wrapper
+
+
+def ahashing_backpressure(view_method):
+    """Асинхронная версия hashing_backpressure."""
+    @wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        from .responses import json_response
+        try:
+            return await view_method(self, request, *args, **kwargs)
+        except HasherBusy as e:
+            return json_response(
+                {'error': 'Сервер перегружен, повторите запрос позже'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(e.retry_after)}
+            )
+    return wrapper
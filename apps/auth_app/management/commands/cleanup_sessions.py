@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.auth_app.sweeper import SessionSweeper
+
+
+class Command(BaseCommand):
+    help = 'Удаляет истекшие и неактивные сессии пачками'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=float, default=settings.SESSION_RETENTION_DAYS,
+            help='Сколько дней хранить истекшие/отозванные сессии'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.SESSION_SWEEP_BATCH_SIZE,
+            help='Размер пачки удаления'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=settings.SESSION_SWEEP_PAUSE,
+            help='Пауза между пачками, сек'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только посчитать сессии к удалению'
+        )
+
+    def handle(self, *args, **options):
+        sweeper = SessionSweeper(
+            retention=timedelta(days=options['retention_days']),
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'Сессий к удалению: {sweeper.count()}')
+            return
+
+        deleted = sweeper.sweep(
+            progress=lambda n: self.stdout.write(f'  Удалено: {n}')
+        )
+        if deleted is None:
+            self.stdout.write('Очистка уже идет в другом процессе, пропускаем')
+            return
+        self.stdout.write(self.style.SUCCESS(f'Готово! Удалено сессий: {deleted}'))
@@ -1,21 +1,92 @@
+import threading
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject, empty
+
 from .services import AuthService
 
 
+class LazyUser(SimpleLazyObject):
+    """
+    Ленивый пользователь: токен декодируется и проверяется в БД
+    только при первом обращении к request.user.
+    Если токен невалиден, ведет себя как None (bool -> False).
+
+    В async-коде пользователь загружается через await aresolve(),
+    после чего request.user отдает его без обращения к БД.
+    """
+
+    def __init__(self, func, afunc):
+        self.__dict__['_asetupfunc'] = afunc
+        super().__init__(func)
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._wrapped is not empty
+
+    async def aresolve(self):
+        if self._wrapped is empty:
+            self._wrapped = await self._asetupfunc()
+        return self._wrapped
+
+
+async def _anonymous():
+    return None
+
+
 class JWTAuthMiddleware:
     """
     Middleware для JWT аутентификации.
-    Извлекает токен из заголовка Authorization и устанавливает request.user.
+    Извлекает токен из заголовка Authorization и устанавливает request.user
+    и корутину request.auser() для async-представлений.
+    Работает как в WSGI, так и в ASGI.
     """
 
+    sync_capable = True
+    async_capable = True
+
+    # Счетчики: всего запросов, с токеном и без вычисления request.user
+    stats = {'requests': 0, 'with_token': 0, 'skipped': 0}
+    _stats_lock = threading.Lock()
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        self.process_request(request)
+        response = self.get_response(request)
+        self.count(request)
+        return response
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        response = await self.get_response(request)
+        self.count(request)
+        return response
+
+    def process_request(self, request):
         request.user = None
-        
+        request.auser = _anonymous
+
         auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         if auth_header.startswith('Bearer '):
             token = auth_header[7:]
-            request.user = AuthService.get_user_by_token(token)
+            request.user = LazyUser(
+                lambda: AuthService.get_user_by_token(token),
+                lambda: AuthService.aget_user_by_token(token),
+            )
+            request.auser = request.user.aresolve
 
-        return self.get_response(request)
+    def count(self, request):
+        user = request.user
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            if user is not None:
+                self.stats['with_token'] += 1
+            if not isinstance(user, LazyUser) or not user.is_resolved:
+                self.stats['skipped'] += 1
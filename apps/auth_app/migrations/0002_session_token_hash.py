@@ -0,0 +1,45 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_token_hash(apps, schema_editor):
+    Session = apps.get_model('auth_app', 'Session')
+    batch = []
+    for session in Session.objects.only('id', 'token').iterator(chunk_size=2000):
+        session.token_hash = hashlib.sha256(session.token.encode()).hexdigest()
+        batch.append(session)
+        if len(batch) >= 2000:
+            Session.objects.bulk_update(batch, ['token_hash'])
+            batch = []
+    if batch:
+        Session.objects.bulk_update(batch, ['token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='token_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_token_hash, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='session',
+            name='token_hash',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='session',
+            constraint=models.UniqueConstraint(fields=('token_hash',), name='sessions_token_hash_uniq'),
+        ),
+        migrations.RemoveField(
+            model_name='session',
+            name='token',
+        ),
+    ]
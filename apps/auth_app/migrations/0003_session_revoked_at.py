@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_session_token_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='revoked_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0003_session_revoked_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['is_active', 'expires_at'], name='sessions_active_expires_idx'),
+        ),
+    ]
@@ -9,17 +9,24 @@ from apps.users.models import User
 class Session(models.Model):
     """
     Модель сессии пользователя.
-    Хранит JWT токен и позволяет инвалидировать сессии.
+    Хранит SHA-256 дайджест JWT токена и позволяет инвалидировать сессии.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sessions')
-    token = models.CharField(max_length=500, unique=True)
+    token_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
     is_active = models.BooleanField(default=True)
+    revoked_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     class Meta:
         db_table = 'sessions'
+        constraints = [
+            models.UniqueConstraint(fields=['token_hash'], name='sessions_token_hash_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['is_active', 'expires_at'], name='sessions_active_expires_idx'),
+        ]
 
     def __str__(self):
         return f"Session {self.id} for {self.user.email}"
@@ -39,4 +46,5 @@ class Session(models.Model):
     def invalidate(self):
         """Инвалидировать сессию."""
         self.is_active = False
-        self.save(update_fields=['is_active'])
+        self.revoked_at = timezone.now()
+        self.save(update_fields=['is_active', 'revoked_at'])
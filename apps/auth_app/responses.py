@@ -0,0 +1,26 @@
+import json
+
+from django.http import HttpResponse
+
+from apps.monitoring.renderers import TimedJSONRenderer
+
+
+def json_response(data, status: int = 200, headers: dict = None) -> HttpResponse:
+    """JSON-ответ для async-представлений, совпадает с выводом DRF."""
+    return HttpResponse(
+        TimedJSONRenderer().render(data),
+        status=status,
+        headers=headers,
+        content_type='application/json',
+    )
+
+
+def parse_json(request):
+    """Разобрать тело запроса. Возвращает (data, None) или (None, response)."""
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None, json_response({'error': 'Некорректный JSON'}, status=400)
+    if not isinstance(data, dict):
+        return None, json_response({'error': 'Ожидался JSON-объект'}, status=400)
+    return data, None
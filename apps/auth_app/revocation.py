@@ -0,0 +1,133 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+class BloomFilter:
+    """Простой фильтр Блума на bytearray."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationFilter:
+    """
+    Множество отозванных токенов (jti = id сессии) внутри процесса.
+
+    Фильтр Блума загружается из БД и инкрементально обновляется по
+    Session.revoked_at не реже раза в refresh_interval секунд.
+    Точная проверка в БД выполняется только при срабатывании фильтра.
+    """
+
+    # Запас на расхождение часов между воркерами
+    CLOCK_SKEW = timedelta(seconds=5)
+
+    def __init__(self, capacity: int, error_rate: float, refresh_interval: int):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self._bloom = None
+        self._synced_at = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.positives = 0
+        self.false_positives = 0
+
+    def load(self):
+        """Полная загрузка отозванных, но еще не истекших сессий."""
+        from .models import Session
+
+        now = timezone.now()
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        revoked = Session.objects.filter(
+            revoked_at__isnull=False, expires_at__gt=now
+        ).values_list('id', flat=True)
+        for session_id in revoked.iterator(chunk_size=5000):
+            bloom.add(str(session_id))
+        self._bloom = bloom
+        self._synced_at = now
+        self._refreshed = time.monotonic()
+
+    def refresh(self):
+        """Догрузить отзывы, появившиеся с прошлой синхронизации."""
+        from .models import Session
+
+        if self._bloom is None or self._bloom.count >= self.capacity:
+            self.load()
+            return
+        now = timezone.now()
+        revoked = Session.objects.filter(
+            revoked_at__gte=self._synced_at - self.CLOCK_SKEW
+        ).values_list('id', flat=True)
+        for session_id in revoked:
+            self._bloom.add(str(session_id))
+        self._synced_at = now
+        self._refreshed = time.monotonic()
+
+    def maybe_refresh(self):
+        if self._bloom is not None and time.monotonic() - self._refreshed < self.refresh_interval:
+            return
+        with self._lock:
+            if self._bloom is None or time.monotonic() - self._refreshed >= self.refresh_interval:
+                self.refresh()
+
+    def add(self, jti):
+        """Локально отметить токен отозванным (без ожидания обновления)."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(str(jti))
+
+    def is_revoked(self, jti: str) -> bool:
+        from .models import Session
+
+        self.maybe_refresh()
+        self.checks += 1
+        if jti not in self._bloom:
+            return False
+        self.positives += 1
+        revoked = Session.objects.filter(id=jti, is_active=False).exists()
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def stats(self) -> dict:
+        bloom = self._bloom
+        return {
+            'items': bloom.count if bloom else 0,
+            'capacity': self.capacity,
+            'bits': bloom.size if bloom else 0,
+            'checks': self.checks,
+            'positives': self.positives,
+            'false_positives': self.false_positives,
+        }
+
+
+revocation_filter = RevocationFilter(
+    capacity=getattr(settings, 'REVOCATION_FILTER_CAPACITY', 100000),
+    error_rate=getattr(settings, 'REVOCATION_FILTER_ERROR_RATE', 0.001),
+    refresh_interval=getattr(settings, 'REVOCATION_REFRESH_SECONDS', 5),
+)
@@ -1,28 +1,42 @@
+import uuid
 import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.utils import timezone
 
 from apps.users.models import User
+from apps.permissions.models import Role
 from apps.users.services import UserService
+from apps.users.hashing import password_hasher
+from apps.monitoring.timing import timed
 from .models import Session
+from .cache import token_cache, token_digest
+from .revocation import revocation_filter
 
 
 class AuthService:
     """Сервис аутентификации."""
 
+    # Поля для загрузки пользователя с ролями через values_list
+    # (роли в порядке назначения, как в User.get_roles)
+    USER_FIELDS = [f.attname for f in User._meta.concrete_fields]
+    ROLE_FIELDS = ['id', 'name', 'description']
+
     @staticmethod
-    def generate_token(user: User) -> str:
-        """Генерация JWT токена."""
+    def generate_token(user: User, jti: str = None) -> str:
+        """Генерация JWT токена. jti - идентификатор сессии."""
         payload = {
             'user_id': str(user.id),
             'email': user.email,
+            'jti': jti or uuid.uuid4().hex,
             'exp': datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRATION_HOURS),
             'iat': datetime.utcnow()
         }
         return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
     @staticmethod
+    @timed('jwt')
     def decode_token(token: str) -> dict | None:
         """Декодирование JWT токена."""
         try:
@@ -42,36 +56,205 @@ class AuthService:
         if not user or not UserService.verify_password(password, user.password_hash):
             return None, None
 
-        token = cls.generate_token(user)
+        session_id = uuid.uuid4()
+        token = cls.generate_token(user, jti=str(session_id))
         
         # Создаем сессию
         Session.objects.create(
+            id=session_id,
             user=user,
-            token=token,
+            token_hash=token_digest(token),
             expires_at=timezone.now() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
         )
         
         return user, token
 
     @classmethod
-    def logout(cls, token: str) -> bool:
-        """Выход из системы - инвалидация сессии."""
-        session = Session.objects.filter(token=token, is_active=True).first()
+    def logout(cls, token_hash: str) -> bool:
+        """Выход из системы - инвалидация сессии по дайджесту токена."""
+        token_cache.invalidate(token_hash)
+        session = Session.objects.filter(token_hash=token_hash, is_active=True).first()
         if session:
             session.invalidate()
+            revocation_filter.add(session.id)
             return True
         return False
 
     @classmethod
+    def logout_all(cls, user: User) -> int:
+        """Инвалидация всех сессий пользователя."""
+        token_cache.invalidate_user(user.id)
+        sessions = Session.objects.filter(user=user, is_active=True)
+        session_ids = list(sessions.values_list('id', flat=True))
+        for session_id in session_ids:
+            revocation_filter.add(session_id)
+        return sessions.filter(id__in=session_ids).update(
+            is_active=False, revoked_at=timezone.now()
+        )
+
+    @classmethod
+    @timed('auth')
     def get_user_by_token(cls, token: str) -> User | None:
-        """Получить пользователя по токену."""
+        """
+        Получить пользователя по токену.
+
+        Сессия, пользователь и его роли загружаются одним запросом,
+        роли запоминаются на объекте пользователя. Итого на
+        аутентификацию уходит 1 запрос к БД (0 при попадании в кеш),
+        плюс сверка кеша с отзывами сессий и изменениями пользователей
+        (включая их роли) не чаще раза в AUTH_CACHE_REFRESH_SECONDS.
+
+        При JWT_STATELESS=True таблица сессий не читается: отзыв
+        проверяется по revocation_filter, а запрос к БД идет только
+        за пользователем с ролями (при промахе кеша).
+        """
         payload = cls.decode_token(token)
         if not payload:
             return None
 
-        # Проверяем сессию в БД
-        session = Session.objects.filter(token=token, is_active=True).first()
-        if not session or not session.is_valid:
+        stateless = settings.JWT_STATELESS and payload.get('jti')
+        if stateless and revocation_filter.is_revoked(payload['jti']):
+            return None
+
+        token_hash = token_digest(token)
+        token_cache.maybe_refresh()
+        user = token_cache.get(token_hash)
+        if user is not None:
+            return user
+
+        if stateless:
+            user = cls._load_user(payload['user_id'])
+            expires_at = datetime.fromtimestamp(payload['exp'], tz=dt_timezone.utc)
+        else:
+            user, expires_at = cls._load_session_user(token_hash)
+        if user is None or str(user.id) != payload['user_id']:
+            return None
+
+        token_cache.set(token_hash, user, expires_at)
+        return user
+
+    @classmethod
+    def _load_session_user(cls, token_hash: str):
+        """
+        Загрузить активную сессию вместе с пользователем и ролями.
+        Возвращает (user, expires_at) или (None, None).
+        """
+        return cls._session_user_from_rows(list(cls._session_user_rows(token_hash)))
+
+    @classmethod
+    def _load_user(cls, user_id: str) -> User | None:
+        """Загрузить активного пользователя вместе с ролями одним запросом."""
+        rows = list(cls._user_rows(user_id))
+        return cls._build_user(rows) if rows else None
+
+    @classmethod
+    def _session_user_rows(cls, token_hash: str):
+        return Session.objects.filter(
+            token_hash=token_hash,
+            is_active=True,
+            expires_at__gt=timezone.now(),
+            user__is_active=True,
+        ).values_list(
+            'expires_at',
+            *[f'user__{f}' for f in cls.USER_FIELDS],
+            *[f'user__user_roles__role__{f}' for f in cls.ROLE_FIELDS],
+        ).order_by('user__user_roles__id')
+
+    @classmethod
+    def _user_rows(cls, user_id: str):
+        return User.objects.filter(id=user_id, is_active=True).values_list(
+            *cls.USER_FIELDS,
+            *[f'user_roles__role__{f}' for f in cls.ROLE_FIELDS],
+        ).order_by('user_roles__id')
+
+    @classmethod
+    def _session_user_from_rows(cls, rows):
+        if not rows:
+            return None, None
+        return cls._build_user([row[1:] for row in rows]), rows[0][0]
+
+    @classmethod
+    def _build_user(cls, rows) -> User:
+        """Собрать пользователя с ролями из строк (поля user + поля role)."""
+        n = len(cls.USER_FIELDS)
+        user = User.from_db('default', cls.USER_FIELDS, rows[0][:n])
+        user.set_roles(
+            Role.from_db('default', cls.ROLE_FIELDS, row[n:])
+            for row in rows
+            if row[n] is not None
+        )
+        return user
+
+    # Асинхронные версии для ASGI (config/asgi.py)
+
+    @classmethod
+    async def alogin(cls, email: str, password: str) -> tuple[User, str] | tuple[None, None]:
+        """Асинхронная аутентификация, bcrypt выполняется вне event loop."""
+        user = await UserService.aget_by_email(email)
+        if not user or not await password_hasher.averify_password(password, user.password_hash):
+            return None, None
+
+        session_id = uuid.uuid4()
+        token = cls.generate_token(user, jti=str(session_id))
+        await Session.objects.acreate(
+            id=session_id,
+            user=user,
+            token_hash=token_digest(token),
+            expires_at=timezone.now() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
+        )
+        await user.aget_roles()
+        return user, token
+
+    @classmethod
+    async def alogout(cls, token_hash: str) -> bool:
+        token_cache.invalidate(token_hash)
+        session = await Session.objects.filter(token_hash=token_hash, is_active=True).afirst()
+        if session:
+            session.is_active = False
+            session.revoked_at = timezone.now()
+            await session.asave(update_fields=['is_active', 'revoked_at'])
+            revocation_filter.add(session.id)
+            return True
+        return False
+
+    @classmethod
+    async def alogout_all(cls, user: User) -> int:
+        token_cache.invalidate_user(user.id)
+        sessions = Session.objects.filter(user=user, is_active=True)
+        session_ids = [session_id async for session_id in sessions.values_list('id', flat=True)]
+        for session_id in session_ids:
+            revocation_filter.add(session_id)
+        return await sessions.filter(id__in=session_ids).aupdate(
+            is_active=False, revoked_at=timezone.now()
+        )
+
+    @classmethod
+    @timed('auth')
+    async def aget_user_by_token(cls, token: str) -> User | None:
+        """Асинхронная версия get_user_by_token (те же запросы)."""
+        payload = cls.decode_token(token)
+        if not payload:
+            return None
+
+        stateless = settings.JWT_STATELESS and payload.get('jti')
+        if stateless and await sync_to_async(revocation_filter.is_revoked)(payload['jti']):
+            return None
+
+        token_hash = token_digest(token)
+        await token_cache.amaybe_refresh()
+        user = token_cache.get(token_hash)
+        if user is not None:
+            return user
+
+        if stateless:
+            rows = [row async for row in cls._user_rows(payload['user_id'])]
+            user = cls._build_user(rows) if rows else None
+            expires_at = datetime.fromtimestamp(payload['exp'], tz=dt_timezone.utc)
+        else:
+            rows = [row async for row in cls._session_user_rows(token_hash)]
+            user, expires_at = cls._session_user_from_rows(rows)
+        if user is None or str(user.id) != payload['user_id']:
             return None
 
-        return User.objects.filter(id=payload['user_id'], is_active=True).first()
+        token_cache.set(token_hash, user, expires_at)
+        return user
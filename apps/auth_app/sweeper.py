@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .models import Session
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """
+    Удаление истекших и неактивных сессий небольшими пачками.
+
+    Сессия удаляется, если она истекла или была отозвана раньше, чем
+    retention назад. В режиме JWT_STATELESS отозванная сессия живет до
+    истечения: по ней фильтр отзыва подтверждает отзыв токена.
+
+    На PostgreSQL проход держит advisory lock: из всех воркеров и
+    cleanup_sessions одновременно чистит только один процесс.
+    """
+
+    # Ключ pg_try_advisory_lock прохода очистки
+    LOCK_KEY = 7_001_001
+
+    def __init__(self, retention: timedelta, batch_size: int, pause: float):
+        self.retention = retention
+        self.batch_size = batch_size
+        self.pause = pause
+        self._thread = None
+
+    def candidates(self, now=None):
+        """Querysets кандидатов на удаление (под индекс is_active, expires_at)."""
+        cutoff = (now or timezone.now()) - self.retention
+        querysets = [
+            Session.objects.filter(is_active=True, expires_at__lt=cutoff),
+            Session.objects.filter(is_active=False, expires_at__lt=cutoff),
+        ]
+        if not settings.JWT_STATELESS:
+            querysets.append(Session.objects.filter(
+                is_active=False, revoked_at__lt=cutoff, expires_at__gte=cutoff
+            ))
+        return querysets
+
+    def count(self) -> int:
+        return sum(qs.count() for qs in self.candidates())
+
+    def sweep(self, progress=None) -> int | None:
+        """
+        Удалить сессии пачками. progress(deleted) вызывается после каждой пачки.
+        Возвращает число удаленных или None, если проход уже идет в другом процессе.
+        """
+        with self._exclusive() as locked:
+            if not locked:
+                return None
+            return self._sweep(progress)
+
+    @contextmanager
+    def _exclusive(self):
+        """pg_try_advisory_lock на время прохода; на других СУБД блокировки нет."""
+        if connection.vendor != 'postgresql':
+            yield True
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [self.LOCK_KEY])
+            locked = cursor.fetchone()[0]
+        try:
+            yield locked
+        finally:
+            if locked:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', [self.LOCK_KEY])
+
+    def _sweep(self, progress) -> int:
+        deleted = 0
+        for queryset in self.candidates():
+            while True:
+                ids = list(queryset.values_list('id', flat=True)[:self.batch_size])
+                if not ids:
+                    break
+                Session.objects.filter(id__in=ids).delete()
+                deleted += len(ids)
+                if progress:
+                    progress(deleted)
+                if len(ids) < self.batch_size:
+                    break
+                # Даем другим транзакциям взять блокировки
+                time.sleep(self.pause)
+        return deleted
+
+    def start(self, interval: int):
+        """
+        Запустить периодическую очистку в фоновом потоке. Вызывается из
+        config/wsgi.py и config/asgi.py, то есть только в веб-процессах.
+        """
+        if self._thread is not None or interval <= 0:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval,), name='session-sweeper', daemon=True
+        )
+        self._thread.start()
+
+    def _loop(self, interval: int):
+        while True:
+            time.sleep(interval)
+            try:
+                close_old_connections()
+                deleted = self.sweep()
+                if deleted:
+                    logger.info('Удалено сессий: %s', deleted)
+            except Exception:
+                logger.exception('Ошибка очистки сессий')
+            finally:
+                close_old_connections()
+
+
+session_sweeper = SessionSweeper(
+    retention=timedelta(days=getattr(settings, 'SESSION_RETENTION_DAYS', 7)),
+    batch_size=getattr(settings, 'SESSION_SWEEP_BATCH_SIZE', 1000),
+    pause=getattr(settings, 'SESSION_SWEEP_PAUSE', 0.1),
+)
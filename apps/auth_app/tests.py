@@ -0,0 +1,72 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.permissions.versions import version_tracker
+from apps.users.models import User
+from .cache import token_cache, token_digest
+from .models import Session
+from .services import AuthService
+
+
+class TokenCacheRefreshTests(TestCase):
+    """
+    Изменения из другого процесса удаляют из кеша только свои записи.
+    refresh_interval=0: сверка (2 запроса) идет при каждом вызове.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create(email='alice@example.com', password_hash='-', first_name='А', last_name='А')
+        cls.bob = User.objects.create(email='bob@example.com', password_hash='-', first_name='Б', last_name='Б')
+        # Создание пользователей - вне окна сверки (с запасом CLOCK_SKEW)
+        User.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+
+    def setUp(self):
+        token_cache.clear()
+        for patcher in (
+            mock.patch.object(token_cache, 'refresh_interval', 0),
+            # Сверка версий ролей не должна попадать в подсчет запросов
+            mock.patch.object(version_tracker, 'interval', 3600),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.alice_token = self.login(self.alice)
+        self.bob_token = self.login(self.bob)
+        # Оба пользователя в кеше
+        self.assertIsNotNone(AuthService.get_user_by_token(self.alice_token))
+        self.assertIsNotNone(AuthService.get_user_by_token(self.bob_token))
+
+    def login(self, user) -> str:
+        session = Session.objects.create(
+            user=user, token_hash='-', expires_at=timezone.now() + timedelta(hours=1),
+        )
+        token = AuthService.generate_token(user, jti=str(session.id))
+        Session.objects.filter(pk=session.pk).update(token_hash=token_digest(token))
+        return token
+
+    def test_revoked_session_dropped(self):
+        # Отзыв в другом процессе: локальный кеш не трогаем
+        Session.objects.filter(token_hash=token_digest(self.alice_token)).update(
+            is_active=False, revoked_at=timezone.now()
+        )
+        with self.assertNumQueries(3):  # сверка + загрузка alice
+            self.assertIsNone(AuthService.get_user_by_token(self.alice_token))
+        with self.assertNumQueries(2):  # только сверка, bob из кеша
+            self.assertIsNotNone(AuthService.get_user_by_token(self.bob_token))
+
+    def test_updated_user_dropped(self):
+        User.objects.filter(pk=self.alice.pk).update(first_name='Алиса', updated_at=timezone.now())
+        with self.assertNumQueries(3):
+            self.assertEqual(AuthService.get_user_by_token(self.alice_token).first_name, 'Алиса')
+        with self.assertNumQueries(2):
+            self.assertIsNotNone(AuthService.get_user_by_token(self.bob_token))
+
+    def test_unchanged_users_stay_cached(self):
+        hits = token_cache.stats()['hits']
+        with self.assertNumQueries(4):
+            self.assertIsNotNone(AuthService.get_user_by_token(self.alice_token))
+            self.assertIsNotNone(AuthService.get_user_by_token(self.bob_token))
+        self.assertEqual(token_cache.stats()['hits'], hits + 2)
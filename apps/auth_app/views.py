@@ -4,13 +4,15 @@ from rest_framework import status
 
 from .serializers import LoginSerializer
 from .services import AuthService
-from .decorators import login_required
-from apps.users.serializers import UserSerializer
+from .cache import token_digest
+from .decorators import login_required, hashing_backpressure
+from apps.users.serializers import user_data
 
 
 class LoginView(APIView):
     """Вход в систему."""
 
+    @hashing_backpressure
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if not serializer.is_valid():
@@ -29,7 +31,7 @@ class LoginView(APIView):
 
         return Response({
             'token': token,
-            'user': UserSerializer(user).data
+            'user': user_data(user)
         })
 
 
@@ -39,5 +41,5 @@ class LogoutView(APIView):
     @login_required
     def post(self, request):
         token = request.META.get('HTTP_AUTHORIZATION', '').replace('Bearer ', '')
-        AuthService.logout(token)
+        AuthService.logout(token_digest(token))
         return Response({'message': 'Выход выполнен'})
@@ -0,0 +1,69 @@
+from django.db import models
+
+from apps.users.models import User
+
+
+class Product(models.Model):
+    """Товар."""
+    name = models.CharField(max_length=255)
+    price = models.PositiveIntegerField()
+    owner = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='products', db_index=False
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'products'
+        # Выборка своих объектов в порядке id идет по одному индексу
+        indexes = [
+            models.Index(fields=['owner', 'id'], name='products_owner_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class Order(models.Model):
+    """Заказ пользователя."""
+    STATUS_CHOICES = [
+        ('new', 'Новый'),
+        ('processing', 'В обработке'),
+        ('completed', 'Выполнен'),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='orders')
+    quantity = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='orders', db_index=False
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'orders'
+        indexes = [
+            models.Index(fields=['owner', 'id'], name='orders_owner_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"Заказ {self.pk}"
+
+
+class Report(models.Model):
+    """Отчет."""
+    name = models.CharField(max_length=255)
+    type = models.CharField(max_length=50)
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='reports', db_index=False
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'reports'
+        indexes = [
+            models.Index(fields=['owner', 'id'], name='reports_owner_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+from .models import Product, Order, Report
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    owner_id = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'price', 'owner_id']
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    product_id = serializers.PrimaryKeyRelatedField(
+        source='product', queryset=Product.objects.all()
+    )
+    owner_id = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ['id', 'product_id', 'quantity', 'status', 'owner_id']
+
+
+class ReportSerializer(serializers.ModelSerializer):
+    owner_id = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = Report
+        fields = ['id', 'name', 'type', 'owner_id']
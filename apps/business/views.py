@@ -3,33 +3,34 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from apps.auth_app.decorators import login_required
+from apps.permissions.models import SCOPE_ALL
+from apps.permissions.pagination import paginate, PaginationError
 from apps.permissions.services import PermissionService
-from .mock_data import PRODUCTS, ORDERS, REPORTS
+from .models import Product, Order, Report
+from .serializers import ProductSerializer, OrderSerializer, ReportSerializer
 
 
 class BaseBusinessView(APIView):
     """Базовый класс для бизнес-ресурсов с проверкой прав."""
     resource_code = None
-    mock_data = None
+    model = None
+    serializer_class = None
+    not_found_message = 'Объект не найден'
 
-    def check_access(self, request, action: str, obj_id: int = None):
+    def check_access(self, request, action: str, obj=None):
         """
         Проверка доступа.
+        obj - уже загруженный объект, по нему определяется владелец.
         Возвращает (True, None) если доступ есть,
         или (False, Response) с ошибкой.
         """
-        if not hasattr(request, 'user') or request.user is None:
+        if not getattr(request, 'user', None):
             return False, Response(
                 {'error': 'Требуется аутентификация'},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Проверяем владельца для конкретного объекта
-        is_owner = False
-        if obj_id and self.mock_data:
-            obj = next((x for x in self.mock_data if x['id'] == obj_id), None)
-            if obj:
-                is_owner = str(obj.get('owner_id')) == str(request.user.id)
+        is_owner = obj is not None and obj.owner_id == request.user.id
 
         if not PermissionService.check_permission(
             request.user, self.resource_code, action, is_owner
@@ -41,115 +42,174 @@ class BaseBusinessView(APIView):
 
         return True, None
 
+    def list_objects(self, request):
+        """
+        Список объектов в пределах области чтения пользователя.
+        Возвращает (queryset, None) или (None, Response) с ошибкой.
+        С правом только на свои объекты фильтрует по owner_id в БД
+        (индекс по владельцу).
+        """
+        if not getattr(request, 'user', None):
+            return None, Response(
+                {'error': 'Требуется аутентификация'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        scope = PermissionService.get_scope(request.user, self.resource_code, 'read')
+        if scope is None:
+            return None, Response(
+                {'error': 'Доступ запрещен'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        objects = self.model.objects.all()
+        if scope != SCOPE_ALL:
+            objects = objects.filter(owner_id=request.user.id)
+        return objects, None
+
+    def list_response(self, request, key: str):
+        """Страница списка: {key: [...], 'next_cursor': ...}."""
+        objects, error = self.list_objects(request)
+        if error:
+            return error
+        try:
+            page, next_cursor = paginate(request, objects)
+        except PaginationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            key: self.serializer_class(page, many=True).data,
+            'next_cursor': next_cursor,
+        })
+
+    def get_object(self, request, pk: int, action: str):
+        """
+        Загрузить объект одним запросом и проверить доступ к нему.
+        Возвращает (obj, None) или (None, Response) с ошибкой.
+        """
+        obj = self.model.objects.filter(pk=pk).first()
+        has_access, error = self.check_access(request, action, obj)
+        if not has_access:
+            return None, error
+        if obj is None:
+            return None, Response(
+                {'error': self.not_found_message}, status=status.HTTP_404_NOT_FOUND
+            )
+        return obj, None
+
+    def create_object(self, request):
+        has_access, error = self.check_access(request, 'create')
+        if not has_access:
+            return error
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save(owner_id=request.user.id)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def update_object(self, request, pk: int):
+        obj, error = self.get_object(request, pk, 'update')
+        if error:
+            return error
+        serializer = self.serializer_class(obj, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save()
+        return Response(serializer.data)
+
 
 class ProductsView(BaseBusinessView):
-    """Mock API для товаров."""
+    """API для товаров."""
     resource_code = 'products'
-    mock_data = PRODUCTS
+    model = Product
+    serializer_class = ProductSerializer
 
     def get(self, request):
-        """Получить список товаров."""
-        has_access, error = self.check_access(request, 'read')
-        if not has_access:
-            return error
-        return Response({'products': PRODUCTS})
+        """Получить список товаров (все или только свои)."""
+        return self.list_response(request, 'products')
 
     def post(self, request):
         """Создать товар."""
-        has_access, error = self.check_access(request, 'create')
-        if not has_access:
-            return error
-        return Response({'message': 'Товар создан (mock)', 'data': request.data})
+        return self.create_object(request)
 
 
 class ProductDetailView(BaseBusinessView):
-    """Mock API для конкретного товара."""
+    """API для конкретного товара."""
     resource_code = 'products'
-    mock_data = PRODUCTS
+    model = Product
+    serializer_class = ProductSerializer
+    not_found_message = 'Товар не найден'
 
     def get(self, request, pk):
         """Получить товар."""
-        has_access, error = self.check_access(request, 'read', pk)
-        if not has_access:
+        product, error = self.get_object(request, pk, 'read')
+        if error:
             return error
-        product = next((p for p in PRODUCTS if p['id'] == pk), None)
-        if not product:
-            return Response({'error': 'Товар не найден'}, status=status.HTTP_404_NOT_FOUND)
-        return Response(product)
+        return Response(ProductSerializer(product).data)
 
     def patch(self, request, pk):
         """Обновить товар."""
-        has_access, error = self.check_access(request, 'update', pk)
-        if not has_access:
-            return error
-        return Response({'message': 'Товар обновлен (mock)', 'id': pk})
+        return self.update_object(request, pk)
 
     def delete(self, request, pk):
         """Удалить товар."""
-        has_access, error = self.check_access(request, 'delete', pk)
-        if not has_access:
+        product, error = self.get_object(request, pk, 'delete')
+        if error:
             return error
-        return Response({'message': 'Товар удален (mock)', 'id': pk})
+        if product.orders.exists():
+            return Response(
+                {'error': 'По товару есть заказы'}, status=status.HTTP_409_CONFLICT
+            )
+        product.delete()
+        return Response({'message': 'Товар удален', 'id': pk})
 
 
 class OrdersView(BaseBusinessView):
-    """Mock API для заказов."""
+    """API для заказов."""
     resource_code = 'orders'
-    mock_data = ORDERS
+    model = Order
+    serializer_class = OrderSerializer
 
     def get(self, request):
-        """Получить список заказов."""
-        has_access, error = self.check_access(request, 'read')
-        if not has_access:
-            return error
-        return Response({'orders': ORDERS})
+        """Получить список заказов (все или только свои)."""
+        return self.list_response(request, 'orders')
 
     def post(self, request):
         """Создать заказ."""
-        has_access, error = self.check_access(request, 'create')
-        if not has_access:
-            return error
-        return Response({'message': 'Заказ создан (mock)', 'data': request.data})
+        return self.create_object(request)
 
 
 class OrderDetailView(BaseBusinessView):
-    """Mock API для конкретного заказа."""
+    """API для конкретного заказа."""
     resource_code = 'orders'
-    mock_data = ORDERS
+    model = Order
+    serializer_class = OrderSerializer
+    not_found_message = 'Заказ не найден'
 
     def get(self, request, pk):
         """Получить заказ."""
-        has_access, error = self.check_access(request, 'read', pk)
-        if not has_access:
+        order, error = self.get_object(request, pk, 'read')
+        if error:
             return error
-        order = next((o for o in ORDERS if o['id'] == pk), None)
-        if not order:
-            return Response({'error': 'Заказ не найден'}, status=status.HTTP_404_NOT_FOUND)
-        return Response(order)
+        return Response(OrderSerializer(order).data)
 
     def patch(self, request, pk):
         """Обновить заказ."""
-        has_access, error = self.check_access(request, 'update', pk)
-        if not has_access:
-            return error
-        return Response({'message': 'Заказ обновлен (mock)', 'id': pk})
+        return self.update_object(request, pk)
 
     def delete(self, request, pk):
         """Удалить заказ."""
-        has_access, error = self.check_access(request, 'delete', pk)
-        if not has_access:
+        order, error = self.get_object(request, pk, 'delete')
+        if error:
             return error
-        return Response({'message': 'Заказ удален (mock)', 'id': pk})
+        order.delete()
+        return Response({'message': 'Заказ удален', 'id': pk})
 
 
 class ReportsView(BaseBusinessView):
-    """Mock API для отчетов."""
+    """API для отчетов."""
     resource_code = 'reports'
-    mock_data = REPORTS
+    model = Report
+    serializer_class = ReportSerializer
 
     def get(self, request):
-        """Получить список отчетов."""
-        has_access, error = self.check_access(request, 'read')
-        if not has_access:
-            return error
-        return Response({'reports': REPORTS})
+        """Получить список отчетов (все или только свои)."""
+        return self.list_response(request, 'reports')
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class MonitoringConfig(AppConfig):
+    name = 'apps.monitoring'
+
+    def ready(self):
+        # Число и время запросов к БД - для каждого соединения в каждом потоке
+        from .timing import install_db_wrapper
+        connection_created.connect(install_db_wrapper, dispatch_uid='monitoring.db_wrapper')
@@ -0,0 +1,161 @@
+"""
+Агрегаты запросов по маршрутам в формате Prometheus.
+
+Гистограммы длительности запроса, этапов (включая db) и числа запросов
+к БД на запрос с метками route (шаблон URL) и method. Счетчики
+накапливаются в процессе воркера; при нескольких воркерах Prometheus
+собирает каждый процесс отдельно.
+"""
+import threading
+
+from django.conf import settings
+
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Гистограмма Prometheus: счетчики по верхним границам, сумма и количество."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: dict):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{_labels(**labels, le=_number(float(bound)))} {cumulative}'
+        yield f'{name}_bucket{_labels(**labels, le="+Inf")} {self.count}'
+        yield f'{name}_sum{_labels(**labels)} {_number(self.sum)}'
+        yield f'{name}_count{_labels(**labels)} {self.count}'
+
+
+class RequestMetrics:
+    """Метрики запросов процесса по маршрутам."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests = {}   # (route, method, status) -> число
+        self._duration = {}   # (route, method) -> Histogram
+        self._stages = {}     # (route, method, stage) -> Histogram
+        self._queries = {}    # (route, method) -> Histogram
+
+    def observe(self, route: str, method: str, status: int, seconds: float, timing):
+        key = (route, method)
+        with self._lock:
+            status_key = (route, method, status)
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            self._histogram(self._duration, key, self.buckets).observe(seconds)
+            self._histogram(self._queries, key, QUERY_BUCKETS).observe(timing.db_queries)
+            if timing.db_queries:
+                self._histogram(self._stages, key + ('db',), self.buckets).observe(timing.db_seconds)
+            for name, (stage_seconds, _) in timing.stages.items():
+                self._histogram(self._stages, key + (name,), self.buckets).observe(stage_seconds)
+
+    @staticmethod
+    def _histogram(histograms: dict, key, buckets) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+    def clear(self):
+        with self._lock:
+            self._requests.clear()
+            self._duration.clear()
+            self._stages.clear()
+            self._queries.clear()
+
+    def lines(self):
+        """Строки экспозиции Prometheus для метрик запросов."""
+        with self._lock:
+            yield '# HELP http_requests_total Requests by route, method and status.'
+            yield '# TYPE http_requests_total counter'
+            for (route, method, status), count in sorted(self._requests.items()):
+                yield f'http_requests_total{_labels(route=route, method=method, status=status)} {count}'
+
+            yield '# HELP http_request_duration_seconds Request duration by route.'
+            yield '# TYPE http_request_duration_seconds histogram'
+            for (route, method), histogram in sorted(self._duration.items()):
+                yield from histogram.lines(
+                    'http_request_duration_seconds', {'route': route, 'method': method}
+                )
+
+            yield '# HELP http_request_stage_seconds Time spent in a named stage per request.'
+            yield '# TYPE http_request_stage_seconds histogram'
+            for (route, method, name), histogram in sorted(self._stages.items()):
+                yield from histogram.lines(
+                    'http_request_stage_seconds', {'route': route, 'method': method, 'stage': name}
+                )
+
+            yield '# HELP http_request_db_queries Database queries per request.'
+            yield '# TYPE http_request_db_queries histogram'
+            for (route, method), histogram in sorted(self._queries.items()):
+                yield from histogram.lines(
+                    'http_request_db_queries', {'route': route, 'method': method}
+                )
+
+
+def process_stats() -> dict:
+    """Счетчики кешей и пулов процесса: {префикс метрики: stats()}."""
+    from apps.auth_app.cache import token_cache
+    from apps.auth_app.middleware import JWTAuthMiddleware
+    from apps.auth_app.revocation import revocation_filter
+    from apps.permissions.cache import permissions_cache
+    from apps.users.hashing import password_hasher
+
+    return {
+        'token_cache': token_cache.stats(),
+        'revocation_filter': revocation_filter.stats(),
+        'password_hasher': password_hasher.stats(),
+        'jwt_auth': dict(JWTAuthMiddleware.stats),
+        'permissions_cache': permissions_cache.stats(),
+    }
+
+
+def render() -> str:
+    """Полный текст /metrics."""
+    lines = list(request_metrics.lines())
+    for prefix, stats in process_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f'{prefix}_{key}'
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics(
+    buckets=getattr(
+        settings, 'REQUEST_TIMING_BUCKETS',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+)
@@ -0,0 +1,72 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import timing
+from .metrics import request_metrics
+
+
+class RequestTimingMiddleware:
+    """
+    Замер запроса: общее время, этапы (auth, jwt, permissions, bcrypt,
+    render) и запросы к БД.
+    Пишет заголовок Server-Timing и копит гистограммы по маршрутам для
+    /metrics. Стоит первым в MIDDLEWARE, чтобы учитывать остальные.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'SERVER_TIMING_HEADER', True)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request_timing, token = timing.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing.finish(token)
+        self.record(request, response, request_timing, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        request_timing, token = timing.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing.finish(token)
+        self.record(request, response, request_timing, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, request_timing, seconds: float):
+        match = request.resolver_match
+        route = match.route if match else 'unmatched'
+        request_metrics.observe(route, request.method, response.status_code, seconds, request_timing)
+        if self.server_timing:
+            response['Server-Timing'] = self.header(request_timing, seconds)
+
+    @staticmethod
+    def header(request_timing, seconds: float) -> str:
+        """Значение Server-Timing: этапы и total в миллисекундах."""
+        parts = [
+            f'{name};dur={stage_seconds * 1000:.2f}'
+            for name, (stage_seconds, _) in request_timing.stages.items()
+        ]
+        if request_timing.db_queries:
+            parts.append(
+                f'db;dur={request_timing.db_seconds * 1000:.2f};desc="{request_timing.db_queries} queries"'
+            )
+        parts.append(f'total;dur={seconds * 1000:.2f}')
+        return ', '.join(parts)
@@ -0,0 +1,11 @@
+from rest_framework.renderers import JSONRenderer
+
+from .timing import stage
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer, время которого учитывается как этап render."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with stage('render'):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase, override_settings
+
+
+@override_settings(METRICS_ALLOWED_IPS=['127.0.0.1', '10.1.0.0/16'], METRICS_TOKEN='')
+class MetricsAccessTests(SimpleTestCase):
+    """/metrics открыт только разрешенным адресам и по токену."""
+
+    def test_allowed_address(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code, 200)
+
+    def test_other_address_forbidden(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='203.0.113.5')
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(b'token_cache', response.content)
+        # Заголовок прокси не подменяет адрес клиента
+        response = self.client.get('/metrics', REMOTE_ADDR='203.0.113.5', HTTP_X_FORWARDED_FOR='127.0.0.1')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token(self):
+        remote = {'REMOTE_ADDR': '203.0.113.5'}
+        ok = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret', **remote)
+        self.assertEqual(ok.status_code, 200)
+        bad = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong', **remote)
+        self.assertEqual(bad.status_code, 403)
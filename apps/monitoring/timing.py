@@ -0,0 +1,105 @@
+"""
+Замер этапов обработки запроса.
+
+RequestTimingMiddleware кладет RequestTiming в contextvar на время
+запроса; stage() и timed() добавляют в него время именованных этапов,
+db_wrapper - число и время запросов к БД. Вне запроса (команды, фоновые
+потоки) замеры ничего не делают. contextvar переходит в потоки
+sync_to_async, поэтому этапы async-представлений тоже учитываются.
+"""
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current: ContextVar['RequestTiming | None'] = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Этапы одного запроса: {имя: [секунды, вызовы]} и счетчики БД."""
+
+    __slots__ = ('stages', 'active', 'db_queries', 'db_seconds')
+
+    def __init__(self):
+        self.stages = {}
+        self.active = set()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+    def add(self, name: str, seconds: float):
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+
+def current() -> RequestTiming | None:
+    return _current.get()
+
+
+def start() -> tuple[RequestTiming, object]:
+    """Начать замер запроса. Возвращает (timing, токен для finish)."""
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def finish(token):
+    _current.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Учесть время блока как этап name. Вложенный этап с тем же именем не считается дважды."""
+    timing = _current.get()
+    if timing is None or name in timing.active:
+        yield
+        return
+    timing.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.active.discard(name)
+        timing.add(name, time.perf_counter() - started)
+
+
+def timed(name: str):
+    """Декоратор: вызов функции (обычной или async) - этап name."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def db_wrapper(execute, sql, params, many, context):
+    """execute_wrapper соединения: число и время запросов текущего запроса."""
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db_queries += 1
+        timing.db_seconds += time.perf_counter() - started
+
+
+def install_db_wrapper(sender, connection, **kwargs):
+    """Обработчик connection_created: подключить db_wrapper к новому соединению."""
+    if db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_wrapper)
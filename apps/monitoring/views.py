@@ -0,0 +1,36 @@
+import hmac
+import ipaddress
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from apps.auth_app.responses import json_response
+from . import metrics
+
+
+def _allowed(request) -> bool:
+    """
+    Доступ к метрикам: заголовок Authorization: Bearer <METRICS_TOKEN>
+    (если токен задан) или адрес клиента из METRICS_ALLOWED_IPS.
+    Адрес берется из REMOTE_ADDR, X-Forwarded-For не учитывается.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if hmac.compare_digest(header.encode(), f'Bearer {token}'.encode()):
+            return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+    )
+
+
+def metrics_view(request):
+    """Метрики процесса в текстовом формате Prometheus."""
+    if not _allowed(request):
+        return json_response({'error': 'Доступ запрещен'}, status=403)
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,27 @@
+import logging
+
+from django.apps import AppConfig
+from django.conf import settings
+
+from config.process import serves_requests
+
+logger = logging.getLogger(__name__)
+
+
+class PermissionsConfig(AppConfig):
+    name = 'apps.permissions'
+
+    def ready(self):
+        # Команды (migrate, shell, test, сама warmup) не прогреваем
+        if not getattr(settings, 'WARMUP_ON_STARTUP', False) or not serves_requests():
+            return
+        # Процесс начинает принимать запросы только после прогрева
+        from . import warmup
+        try:
+            warmup.run()
+        except Exception:
+            logger.exception('Прогрев не выполнен, процесс стартует холодным')
+        finally:
+            # Не передаем открытое соединение в дочерние процессы (--preload)
+            from django.db import connections
+            connections.close_all()
@@ -0,0 +1,22 @@
+from django.views import View
+
+from .services import PermissionService
+from .decorators import aconditional_get
+from .versions import RULES_VERSION
+from apps.auth_app.decorators import alogin_required
+from apps.auth_app.responses import json_response
+
+
+class MyPermissionsAsyncView(View):
+    """Получить свои права доступа (ASGI)."""
+
+    @alogin_required
+    @aconditional_get(RULES_VERSION, per_user=True)
+    async def get(self, request):
+        user = await request.auser()
+        permissions = await PermissionService.aget_user_permissions(user)
+        return json_response({
+            'user': user.email,
+            'roles': [r.name for r in await user.aget_roles()],
+            'permissions': permissions
+        })
@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class EffectivePermissionsCache:
+    """
+    LRU-кеш объединенных прав пользователя внутри процесса.
+    Ключ - (user_id, User.roles_version, версия правил), поэтому изменение
+    ролей пользователя делает недостижимой только его запись, а изменение
+    правил - все.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else None,
+            }
+
+
+permissions_cache = EffectivePermissionsCache(
+    maxsize=getattr(settings, 'PERMISSIONS_CACHE_SIZE', 10000),
+)
@@ -0,0 +1,72 @@
+import hashlib
+from functools import wraps
+
+from rest_framework.response import Response
+from rest_framework import status
+
+from .versions import version_tracker
+
+
+def _make_etag(parts) -> str:
+    return '"%s"' % hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def _not_modified(request, etag: str) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+
+
+def conditional_get(*version_keys, per_user=False):
+    """
+    Декоратор условного GET: сильный ETag из счетчиков версий.
+
+    ETag строится до выполнения представления, из версий (version_tracker),
+    пути с параметрами и, при per_user, id и версии ролей пользователя. Если он совпал с
+    If-None-Match, возвращается 304 без обращения к данным и сериализаторам.
+    Ставится под декоратором проверки доступа.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            parts = [request.get_full_path()]
+            parts += [f'{key}={version_tracker.get(key)}' for key in version_keys]
+            if per_user:
+                parts.append(f'{request.user.id}:{request.user.roles_version}')
+            etag = _make_etag(parts)
+
+            if _not_modified(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
+
+
+def aconditional_get(*version_keys, per_user=False):
+    """Асинхронная версия conditional_get."""
+    def decorator(view_method):
+        @wraps(view_method)
+        async def wrapper(self, request, *args, **kwargs):
+            from django.http import HttpResponseNotModified
+
+            parts = [request.get_full_path()]
+            parts += [f'{key}={await version_tracker.aget(key)}' for key in version_keys]
+            if per_user:
+                user = await request.auser()
+                parts.append(f'{user.id}:{user.roles_version}')
+            etag = _make_etag(parts)
+
+            if _not_modified(request, etag):
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+
+            response = await view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
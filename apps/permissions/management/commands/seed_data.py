@@ -1,11 +1,48 @@
+import hashlib
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.auth_app.models import Session
 from apps.users.models import User
 from apps.users.services import UserService
-from apps.permissions.models import Role, Resource, Permission, UserRole
+from apps.permissions.models import ACTION_BITS, Role, Resource, Permission, UserRole
+from apps.business.models import Product, Order, Report
+from apps.permissions.versions import (
+    version_tracker, RULES_VERSION, USER_ROLES_VERSION, ROLES_VERSION,
+    RESOURCES_VERSION, USERS_VERSION
+)
+
+
+FIRST_NAMES = ['Иван', 'Петр', 'Анна', 'Мария', 'Алексей', 'Ольга', 'Сергей', 'Елена', 'Артём', 'Наталья']
+LAST_NAMES = ['Иванов', 'Петров', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов', 'Лебедев', 'Козлов', 'Новиков', 'Морозов']
+PATRONYMICS = ['Иванович', 'Петрович', 'Сергеевич', 'Алексеевич', 'Андреевич', '']
+FULL_MASK = sum(ACTION_BITS.values())
 
 
 class Command(BaseCommand):
-    help = 'Заполняет БД тестовыми данными'
+    help = 'Заполняет БД тестовыми данными (и нагрузочным набором с --users/--roles/--resources)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0, help='Сгенерировать пользователей')
+        parser.add_argument(
+            '--sessions-per-user', type=int, default=0,
+            help='Сессий на каждого сгенерированного пользователя'
+        )
+        parser.add_argument('--resources', type=int, default=0, help='Сгенерировать ресурсов')
+        parser.add_argument('--roles', type=int, default=0, help='Сгенерировать ролей')
+        parser.add_argument(
+            '--max-roles-per-user', type=int, default=3,
+            help='Максимум ролей у сгенерированного пользователя (кроме user)'
+        )
+        parser.add_argument('--password', default='load123', help='Общий пароль сгенерированных пользователей')
+        parser.add_argument('--seed', type=int, default=42, help='Зерно генератора')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Строк в одном bulk_create')
 
     def handle(self, *args, **options):
         self.stdout.write('Создание ролей...')
@@ -20,6 +57,17 @@ class Command(BaseCommand):
         self.stdout.write('Создание тестовых пользователей...')
         self.create_users(roles)
 
+        self.stdout.write('Создание товаров, заказов и отчетов...')
+        self.create_business_data()
+
+        if options['roles'] or options['resources'] or options['users']:
+            self.create_load_data(options)
+
+        # Сбрасываем кеши прав и ETag во всех процессах
+        for key in (ROLES_VERSION, RESOURCES_VERSION, RULES_VERSION,
+                    USER_ROLES_VERSION, USERS_VERSION):
+            version_tracker.bump(key)
+
         self.stdout.write(self.style.SUCCESS('Готово!'))
 
     def create_roles(self):
@@ -132,3 +180,126 @@ class Command(BaseCommand):
                 UserRole.objects.filter(user=user).delete()
                 UserRole.objects.create(user=user, role=roles[data['role']])
                 self.stdout.write(f"  Создан: {data['email']} ({data['role']})")
+
+    def create_business_data(self):
+        if Product.objects.exists():
+            return
+        users = {u.email: u for u in User.objects.filter(
+            email__in=['admin@test.com', 'manager@test.com', 'user@test.com']
+        )}
+        manager, user, admin = (
+            users['manager@test.com'], users['user@test.com'], users['admin@test.com']
+        )
+
+        products = Product.objects.bulk_create([
+            Product(name='Ноутбук', price=50000, owner=manager),
+            Product(name='Телефон', price=30000, owner=manager),
+            Product(name='Планшет', price=25000, owner=manager),
+        ])
+        Order.objects.bulk_create([
+            Order(product=products[0], quantity=2, status='new', owner=user),
+            Order(product=products[1], quantity=1, status='processing', owner=manager),
+            Order(product=products[2], quantity=3, status='completed', owner=user),
+        ])
+        Report.objects.bulk_create([
+            Report(name='Отчет за январь', type='monthly', owner=admin),
+            Report(name='Отчет за февраль', type='monthly', owner=admin),
+        ])
+
+    def create_load_data(self, options):
+        """
+        Нагрузочный набор: роли load-role-N, ресурсы load-N, правила со
+        случайными масками, пользователи loadN@seed.test с несколькими ролями
+        и сессиями. Все значения, включая UUID, берутся из random.Random(seed),
+        поэтому повторный запуск с тем же зерном дает те же строки и ничего
+        не дублирует (ignore_conflicts). Пароль хешируется один раз на всех.
+        """
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        Role.objects.bulk_create([
+            Role(name=f'load-role-{i}', description=f'Нагрузочная роль {i}')
+            for i in range(options['roles'])
+        ], batch_size=batch_size, ignore_conflicts=True)
+        Resource.objects.bulk_create([
+            Resource(code=f'load-{i}', name=f'Ресурс {i}', description='Нагрузочный ресурс')
+            for i in range(options['resources'])
+        ], batch_size=batch_size, ignore_conflicts=True)
+        role_ids = list(Role.objects.filter(name__startswith='load-role-').order_by('id')
+                        .values_list('id', flat=True))
+        resource_ids = list(Resource.objects.order_by('id').values_list('id', flat=True))
+        self.stdout.write(f'  Ролей: {len(role_ids)}, ресурсов: {len(resource_ids)}')
+
+        # Каждой нагрузочной роли - правила на случайную треть ресурсов
+        permissions = []
+        for role_id in role_ids:
+            for resource_id in resource_ids:
+                if rng.random() < 1 / 3:
+                    permissions.append(Permission(
+                        role_id=role_id, resource_id=resource_id,
+                        actions=rng.randint(1, FULL_MASK),
+                    ))
+            if len(permissions) >= batch_size:
+                Permission.objects.bulk_create(permissions, ignore_conflicts=True)
+                permissions = []
+        Permission.objects.bulk_create(permissions, ignore_conflicts=True)
+
+        if options['users']:
+            self.create_load_users(rng, role_ids, options)
+
+        self.stdout.write(f'  Нагрузочный набор за {time.perf_counter() - started:.1f} с')
+
+    def create_load_users(self, rng, role_ids, options):
+        total = options['users']
+        batch_size = options['batch_size']
+        sessions_per_user = options['sessions_per_user']
+        max_roles = min(options['max_roles_per_user'], len(role_ids))
+        password_hash = UserService.hash_password(options['password'])
+        default_role = Role.objects.get(name='user')
+        hours = settings.JWT_EXPIRATION_HOURS
+        now = timezone.now()
+
+        for start in range(0, total, batch_size):
+            users, user_roles, sessions = [], [], []
+            for i in range(start, min(start + batch_size, total)):
+                user = User(
+                    id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                    email=f'load{i}@seed.test',
+                    password_hash=password_hash,
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    patronymic=rng.choice(PATRONYMICS),
+                    is_active=rng.random() > 0.02,
+                )
+                user.search_text = user.build_search_text()
+                users.append(user)
+
+                user_roles.append(UserRole(user_id=user.id, role=default_role))
+                for role_id in rng.sample(role_ids, rng.randint(0, max_roles)):
+                    user_roles.append(UserRole(user_id=user.id, role_id=role_id))
+
+                for j in range(sessions_per_user):
+                    # Примерно треть сессий истекла, часть отозвана
+                    expires_at = now + timedelta(hours=rng.uniform(-hours / 2, hours))
+                    revoked = rng.random() < 0.1
+                    sessions.append(Session(
+                        id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                        user_id=user.id,
+                        token_hash=hashlib.sha256(f'{options["seed"]}:{i}:{j}'.encode()).hexdigest(),
+                        expires_at=expires_at,
+                        is_active=not revoked,
+                        revoked_at=now if revoked else None,
+                    ))
+
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            # Email, уже созданный с другим --seed, пропущен вставкой: его
+            # сгенерированного id нет в БД, и роли с сессиями для него не нужны
+            stored = set(User.objects.filter(id__in=[user.id for user in users])
+                         .values_list('id', flat=True))
+            user_roles = [user_role for user_role in user_roles if user_role.user_id in stored]
+            sessions = [session for session in sessions if session.user_id in stored]
+            UserRole.objects.bulk_create(user_roles, ignore_conflicts=True)
+            for offset in range(0, len(sessions), batch_size):
+                Session.objects.bulk_create(sessions[offset:offset + batch_size], ignore_conflicts=True)
+            self.stdout.write(f'  Пользователей: {start + len(users)} из {total}')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.permissions import warmup
+
+
+class Command(BaseCommand):
+    help = 'Прогревает кеши процесса и показывает время каждого шага'
+
+    def handle(self, *args, **options):
+        timings = warmup.run()
+        for name, seconds in timings.items():
+            self.stdout.write(f'  {name}: {seconds * 1000:.1f} мс')
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово! Всего: {sum(timings.values()) * 1000:.1f} мс'
+        ))
@@ -0,0 +1,94 @@
+import threading
+
+from .models import ACTION_BITS, Permission, evaluate
+from .versions import version_tracker, RULES_VERSION
+
+
+class PermissionMatrix:
+    """
+    Скомпилированная таблица прав внутри процесса:
+    {resource_code: {role_id: mask}}.
+
+    Проверка прав не делает запросов. Матрица перестраивается одним
+    запросом, когда меняется версия правил (Version 'rules'), которую
+    version_tracker сверяет с БД раз в PERMISSION_VERSION_CHECK_SECONDS.
+    """
+
+    VERSION_KEY = RULES_VERSION
+
+    def __init__(self):
+        self._masks = None
+        self._version = None
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    @staticmethod
+    def _compile(rows) -> dict:
+        masks = {}
+        for role_id, resource_code, mask in rows:
+            masks.setdefault(resource_code, {})[role_id] = mask
+        return masks
+
+    @staticmethod
+    def _rows():
+        return Permission.objects.values_list('role_id', 'resource__code', 'actions')
+
+    def _store(self, masks, version):
+        with self._lock:
+            self._masks = masks
+            self._version = version
+            self.rebuilds += 1
+
+    def rebuild(self):
+        """Перестроить матрицу из БД."""
+        version = version_tracker.get(self.VERSION_KEY)
+        self._store(self._compile(self._rows()), version)
+
+    def masks(self) -> dict:
+        """Актуальная матрица."""
+        version = version_tracker.get(self.VERSION_KEY)
+        if self._masks is None or version != self._version:
+            self._store(self._compile(self._rows()), version)
+        return self._masks
+
+    async def amasks(self) -> dict:
+        version = await version_tracker.aget(self.VERSION_KEY)
+        if self._masks is None or version != self._version:
+            self._store(self._compile([row async for row in self._rows()]), version)
+        return self._masks
+
+    @staticmethod
+    def mask(masks: dict, role_ids, resource_code: str) -> int:
+        """Объединенная маска ролей для ресурса."""
+        by_role = masks.get(resource_code)
+        if not by_role:
+            return 0
+        mask = 0
+        for role_id in role_ids:
+            mask |= by_role.get(role_id, 0)
+        return mask
+
+    def check(self, role_ids, resource_code: str, action: str, is_owner: bool = False) -> bool:
+        return evaluate(self.mask(self.masks(), role_ids, resource_code), action, is_owner)
+
+    async def acheck(self, role_ids, resource_code: str, action: str, is_owner: bool = False) -> bool:
+        return evaluate(self.mask(await self.amasks(), role_ids, resource_code), action, is_owner)
+
+    @staticmethod
+    def effective(masks: dict, role_ids) -> dict:
+        """
+        Объединенные права ролей по всем ресурсам:
+        {resource_code: {action: bool}} для ресурсов, где у ролей есть правило.
+        """
+        result = {}
+        for resource_code, by_role in masks.items():
+            if not any(role_id in by_role for role_id in role_ids):
+                continue
+            mask = 0
+            for role_id in role_ids:
+                mask |= by_role.get(role_id, 0)
+            result[resource_code] = {action: bool(mask & bit) for action, bit in ACTION_BITS.items()}
+        return result
+
+
+permission_matrix = PermissionMatrix()
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+# Порядок битов как в ACTION_BITS на момент миграции
+ACTIONS = ['read', 'read_all', 'create', 'update', 'update_all', 'delete', 'delete_all']
+
+
+def flags_to_mask(apps, schema_editor):
+    Permission = apps.get_model('permissions', 'Permission')
+    permissions = list(Permission.objects.all())
+    for permission in permissions:
+        permission.actions = sum(
+            1 << i for i, action in enumerate(ACTIONS) if getattr(permission, f'can_{action}')
+        )
+    Permission.objects.bulk_update(permissions, ['actions'], batch_size=1000)
+
+
+def mask_to_flags(apps, schema_editor):
+    Permission = apps.get_model('permissions', 'Permission')
+    permissions = list(Permission.objects.all())
+    for permission in permissions:
+        for i, action in enumerate(ACTIONS):
+            setattr(permission, f'can_{action}', bool(permission.actions & (1 << i)))
+    Permission.objects.bulk_update(
+        permissions, [f'can_{action}' for action in ACTIONS], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('permissions', '0002_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='permission',
+            name='actions',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(flags_to_mask, mask_to_flags),
+    ] + [
+        migrations.RemoveField(model_name='permission', name=f'can_{action}')
+        for action in ACTIONS
+    ]
@@ -1,7 +1,54 @@
 from django.db import models
+from django.db.models import F
 from apps.users.models import User
 
 
+# Действия над ресурсом и их биты в скомпилированной матрице прав
+ACTIONS = ['read', 'read_all', 'create', 'update', 'update_all', 'delete', 'delete_all']
+ACTION_BITS = {action: 1 << i for i, action in enumerate(ACTIONS)}
+OWN_BITS = {action: ACTION_BITS[action] for action in ('read', 'create', 'update', 'delete')}
+ALL_BITS = {action: ACTION_BITS.get(f'{action}_all', 0) for action in OWN_BITS}
+
+
+def evaluate(mask: int, action: str, is_owner: bool = False) -> bool:
+    """Разрешено ли действие по битовой маске правил."""
+    if mask & ALL_BITS.get(action, 0):
+        return True
+    own = mask & OWN_BITS.get(action, 0)
+    if action == 'create':
+        return bool(own)
+    return bool(own) and is_owner
+
+
+SCOPE_ALL = 'all'
+SCOPE_OWN = 'own'
+
+
+def scope(mask: int, action: str):
+    """
+    Область действия по битовой маске: SCOPE_ALL - все объекты,
+    SCOPE_OWN - только свои, None - действие запрещено.
+    """
+    if mask & ALL_BITS.get(action, 0):
+        return SCOPE_ALL
+    if mask & OWN_BITS.get(action, 0):
+        return SCOPE_OWN
+    return None
+
+
+def _action_flag(action: str) -> property:
+    """Булево поле can_<action> поверх битовой маски Permission.actions."""
+    bit = ACTION_BITS[action]
+
+    def getter(self) -> bool:
+        return bool(self.actions & bit)
+
+    def setter(self, value: bool):
+        self.actions = self.actions | bit if value else self.actions & ~bit
+
+    return property(getter, setter)
+
+
 class Role(models.Model):
     """
     Роли пользователей: admin, manager, user.
@@ -65,13 +112,16 @@ class Permission(models.Model):
     role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='permissions')
     resource = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='permissions')
     
-    can_read = models.BooleanField(default=False)
-    can_read_all = models.BooleanField(default=False)
-    can_create = models.BooleanField(default=False)
-    can_update = models.BooleanField(default=False)
-    can_update_all = models.BooleanField(default=False)
-    can_delete = models.BooleanField(default=False)
-    can_delete_all = models.BooleanField(default=False)
+    # Биты ACTION_BITS; can_* - свойства поверх маски
+    actions = models.PositiveSmallIntegerField(default=0)
+
+    can_read = _action_flag('read')
+    can_read_all = _action_flag('read_all')
+    can_create = _action_flag('create')
+    can_update = _action_flag('update')
+    can_update_all = _action_flag('update_all')
+    can_delete = _action_flag('delete')
+    can_delete_all = _action_flag('delete_all')
 
     class Meta:
         db_table = 'permissions'
@@ -86,13 +136,28 @@ class Permission(models.Model):
         action: read, create, update, delete
         is_owner: владелец ли пользователь объекта
         """
-        all_perm = getattr(self, f'can_{action}_all', False)
-        own_perm = getattr(self, f'can_{action}', False)
-        
-        if all_perm:
-            return True
-        if action == 'create':
-            return own_perm
-        if own_perm and is_owner:
-            return True
-        return False
+        return evaluate(self.actions, action, is_owner)
+
+
+class Version(models.Model):
+    """
+    Счетчики версий данных (например, правил доступа).
+    Воркеры сравнивают версию со своей и перестраивают локальные кеши.
+    """
+    key = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'versions'
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+    @classmethod
+    def bump(cls, key: str):
+        """Увеличить версию."""
+        if cls.objects.filter(key=key).update(value=F('value') + 1):
+            return
+        _, created = cls.objects.get_or_create(key=key, defaults={'value': 1})
+        if not created:
+            cls.objects.filter(key=key).update(value=F('value') + 1)
@@ -0,0 +1,66 @@
+"""
+Keyset-пагинация списков.
+
+Страница выбирается условием key > последнего ключа предыдущей страницы
+и LIMIT, без OFFSET, поэтому любая страница стоит как первая. Курсор -
+непрозрачная строка (base64 от значения ключа), клиент передает его как есть:
+?cursor=<next_cursor>&page_size=<N>.
+"""
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+
+class PaginationError(ValueError):
+    """Неверный курсор или размер страницы."""
+
+
+def encode_cursor(value) -> str:
+    return base64.urlsafe_b64encode(str(value).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise PaginationError('Неверный курсор')
+
+
+def page_size(request) -> int:
+    """Размер страницы из ?page_size=, не больше LIST_MAX_PAGE_SIZE."""
+    value = request.GET.get('page_size')
+    if value is None:
+        return settings.LIST_PAGE_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        raise PaginationError('Неверный размер страницы')
+    if size < 1:
+        raise PaginationError('Неверный размер страницы')
+    return min(size, settings.LIST_MAX_PAGE_SIZE)
+
+
+def paginate(request, queryset, key: str = 'id'):
+    """
+    Одна страница queryset в порядке key (ключ должен быть уникальным
+    и индексированным). Возвращает (objects, next_cursor); next_cursor
+    равен None на последней странице. Подходит и для queryset.values().
+    """
+    size = page_size(request)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            queryset = queryset.filter(**{f'{key}__gt': decode_cursor(cursor)})
+        except (ValueError, ValidationError):
+            # Значение не приводится к типу ключа
+            raise PaginationError('Неверный курсор')
+    # Лишняя строка показывает, есть ли следующая страница
+    objects = list(queryset.order_by(key)[:size + 1])
+    next_cursor = None
+    if len(objects) > size:
+        objects = objects[:size]
+        last = objects[-1]
+        next_cursor = encode_cursor(last[key] if isinstance(last, dict) else getattr(last, key))
+    return objects, next_cursor
@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Role, UserRole, Resource, Permission
+from .models import ACTION_BITS, Role, UserRole, Resource, Permission
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -49,3 +50,68 @@ class AssignRoleSerializer(serializers.Serializer):
     """Сериализатор для назначения роли."""
     user_id = serializers.UUIDField()
     role_id = serializers.IntegerField()
+
+
+class BulkRoleSerializer(serializers.Serializer):
+    """Сериализатор для массового назначения или снятия ролей."""
+    action = serializers.ChoiceField(choices=['grant', 'revoke'])
+    items = serializers.ListField(
+        child=AssignRoleSerializer(),
+        allow_empty=False,
+        max_length=settings.ROLE_BULK_MAX_ITEMS,
+    )
+
+
+class PermissionCheckItemSerializer(serializers.Serializer):
+    resource_code = serializers.CharField(max_length=50)
+    action = serializers.ChoiceField(choices=['read', 'create', 'update', 'delete'])
+    is_owner = serializers.BooleanField(default=False)
+
+
+class PermissionCheckSerializer(serializers.Serializer):
+    """Сериализатор для пакетной проверки прав."""
+    checks = serializers.ListField(
+        child=PermissionCheckItemSerializer(),
+        allow_empty=False,
+        max_length=settings.PERMISSION_CHECK_MAX_ITEMS,
+    )
+
+
+# Быстрые сериализаторы для списков: строки queryset.values(*..._VALUES)
+# превращаются в dict напрямую, без создания моделей и обхода полей DRF.
+# Вывод совпадает с соответствующими ModelSerializer.
+
+_datetime = serializers.DateTimeField()
+_action_flags = [(f'can_{action}', bit) for action, bit in ACTION_BITS.items()]
+
+# Строки ROLE_VALUES уже совпадают с выводом RoleSerializer
+ROLE_VALUES = ('id', 'name', 'description')
+PERMISSION_VALUES = ('id', 'role_id', 'role__name', 'resource_id', 'resource__code', 'actions')
+USER_ROLE_VALUES = ('id', 'user_id', 'user__email', 'role_id', 'role__name', 'assigned_at')
+
+
+def permission_row(row: dict) -> dict:
+    """Как PermissionSerializer для строки PERMISSION_VALUES."""
+    actions = row['actions']
+    data = {
+        'id': row['id'],
+        'role': row['role_id'],
+        'role_name': row['role__name'],
+        'resource': row['resource_id'],
+        'resource_code': row['resource__code'],
+    }
+    for name, bit in _action_flags:
+        data[name] = bool(actions & bit)
+    return data
+
+
+def user_role_row(row: dict) -> dict:
+    """Как UserRoleSerializer для строки USER_ROLE_VALUES."""
+    return {
+        'id': row['id'],
+        'user': row['user_id'],
+        'user_email': row['user__email'],
+        'role': row['role_id'],
+        'role_name': row['role__name'],
+        'assigned_at': _datetime.to_representation(row['assigned_at']),
+    }
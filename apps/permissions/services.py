@@ -1,4 +1,13 @@
-from .models import Role, Permission, Resource
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Role, Permission, Resource, UserRole, scope
+from .cache import permissions_cache
+from .matrix import permission_matrix, evaluate
+from .versions import version_tracker, USER_ROLES_VERSION
+from apps.monitoring.timing import timed
 from apps.users.models import User
 
 
@@ -6,6 +15,7 @@ class PermissionService:
     """Сервис проверки прав доступа."""
 
     @staticmethod
+    @timed('permissions')
     def check_permission(user: User, resource_code: str, action: str, is_owner: bool = False) -> bool:
         """
         Проверяет, имеет ли пользователь право на действие с ресурсом.
@@ -14,40 +24,189 @@ class PermissionService:
         resource_code: код ресурса (products, orders, etc.)
         action: read, create, update, delete
         is_owner: является ли пользователь владельцем объекта
+
+        Проверка идет по скомпилированной матрице прав, без запросов к БД.
         """
-        roles = user.get_roles()
-        
-        for role in roles:
-            permission = Permission.objects.filter(
-                role=role,
-                resource__code=resource_code
-            ).first()
-            
-            if permission and permission.has_permission(action, is_owner):
-                return True
-        
-        return False
+        role_ids = [role.id for role in user.get_roles()]
+        return permission_matrix.check(role_ids, resource_code, action, is_owner)
 
     @staticmethod
-    def get_user_permissions(user: User) -> dict:
-        """Получить все права пользователя."""
-        result = {}
-        roles = user.get_roles()
-        
-        for role in roles:
-            for perm in Permission.objects.filter(role=role).select_related('resource'):
-                resource_code = perm.resource.code
-                if resource_code not in result:
-                    result[resource_code] = {
-                        'read': False, 'read_all': False,
-                        'create': False,
-                        'update': False, 'update_all': False,
-                        'delete': False, 'delete_all': False,
-                    }
-                
-                # Объединяем права от разных ролей
-                for action in ['read', 'read_all', 'create', 'update', 'update_all', 'delete', 'delete_all']:
-                    if getattr(perm, f'can_{action}', False):
-                        result[resource_code][action] = True
-        
+    @timed('permissions')
+    def check_many(user: User, checks) -> list[bool]:
+        """
+        Пакетная проверка прав.
+        checks: итерируемое (resource_code, action, is_owner).
+        Роли и матрица берутся один раз на весь пакет.
+        """
+        role_ids = [role.id for role in user.get_roles()]
+        masks = permission_matrix.masks()
+        merged = {}
+        result = []
+        for resource_code, action, is_owner in checks:
+            mask = merged.get(resource_code)
+            if mask is None:
+                mask = merged[resource_code] = permission_matrix.mask(masks, role_ids, resource_code)
+            result.append(evaluate(mask, action, is_owner))
         return result
+
+    @staticmethod
+    @timed('permissions')
+    def get_scope(user: User, resource_code: str, action: str = 'read'):
+        """
+        Область действия пользователя над ресурсом:
+        SCOPE_ALL, SCOPE_OWN или None, если действие запрещено.
+        Нужна спискам, чтобы фильтровать по владельцу до выборки.
+        """
+        role_ids = [role.id for role in user.get_roles()]
+        mask = permission_matrix.mask(permission_matrix.masks(), role_ids, resource_code)
+        return scope(mask, action)
+
+    @staticmethod
+    def _chunks(values, size):
+        values = list(values)
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+    @classmethod
+    def _assigned(cls, user_ids) -> dict:
+        """{(user_id, role_id): id назначения} для пользователей user_ids."""
+        assigned = {}
+        for chunk in cls._chunks(user_ids, settings.ROLE_BULK_BATCH_SIZE):
+            for pk, user_id, role_id in UserRole.objects.filter(
+                user_id__in=chunk
+            ).values_list('id', 'user_id', 'role_id'):
+                assigned[(user_id, role_id)] = pk
+        return assigned
+
+    @classmethod
+    def grant_roles(cls, pairs) -> list[str]:
+        """
+        Массовое назначение ролей. pairs: список (user_id, role_id).
+        Возвращает статус каждой пары в том же порядке: created, exists,
+        user_not_found, role_not_found.
+
+        Проверка id и поиск уже назначенных ролей идут запросами по пачкам
+        ROLE_BULK_BATCH_SIZE, вставка - bulk_create(ignore_conflicts=True),
+        поэтому число запросов зависит только от числа пачек.
+        Все пачки и увеличение версий ролей - в одной транзакции.
+        """
+        with transaction.atomic():
+            statuses, changed_users = cls._grant_roles(pairs)
+            if changed_users:
+                cls.roles_changed(changed_users)
+        return statuses
+
+    @classmethod
+    def _grant_roles(cls, pairs) -> tuple[list[str], set]:
+        """Статусы пар и id пользователей, которым назначены новые роли."""
+        user_ids = {user_id for user_id, _ in pairs}
+        existing_users = set()
+        for chunk in cls._chunks(user_ids, settings.ROLE_BULK_BATCH_SIZE):
+            existing_users.update(User.objects.filter(id__in=chunk).values_list('id', flat=True))
+        existing_roles = set(Role.objects.filter(
+            id__in={role_id for _, role_id in pairs}
+        ).values_list('id', flat=True))
+        assigned = cls._assigned(existing_users)
+
+        statuses = []
+        new = {}
+        for pair in pairs:
+            user_id, role_id = pair
+            if user_id not in existing_users:
+                statuses.append('user_not_found')
+            elif role_id not in existing_roles:
+                statuses.append('role_not_found')
+            elif pair in assigned or pair in new:
+                statuses.append('exists')
+            else:
+                new[pair] = UserRole(user_id=user_id, role_id=role_id)
+                statuses.append('created')
+
+        # ignore_conflicts: параллельно назначенные роли не ломают вставку
+        UserRole.objects.bulk_create(
+            new.values(), batch_size=settings.ROLE_BULK_BATCH_SIZE, ignore_conflicts=True
+        )
+        return statuses, {user_id for user_id, _ in new}
+
+    @classmethod
+    def revoke_roles(cls, pairs) -> list[str]:
+        """
+        Массовое снятие ролей. pairs: список (user_id, role_id).
+        Возвращает статус каждой пары: revoked или not_assigned.
+        Удаление - один DELETE по id назначений на пачку; все пачки и
+        увеличение версий ролей - в одной транзакции.
+        """
+        with transaction.atomic():
+            assigned = cls._assigned({user_id for user_id, _ in pairs})
+            statuses = []
+            to_delete = set()
+            changed_users = set()
+            for pair in pairs:
+                pk = assigned.get(pair)
+                if pk is None:
+                    statuses.append('not_assigned')
+                else:
+                    to_delete.add(pk)
+                    changed_users.add(pair[0])
+                    statuses.append('revoked')
+            for chunk in cls._chunks(to_delete, settings.ROLE_BULK_BATCH_SIZE):
+                UserRole.objects.filter(id__in=chunk).delete()
+            if changed_users:
+                cls.roles_changed(changed_users)
+        return statuses
+
+    @staticmethod
+    def rules_changed():
+        """Вызывать после изменения правил доступа."""
+        version_tracker.bump(permission_matrix.VERSION_KEY)
+
+    @classmethod
+    def roles_changed(cls, user_ids):
+        """
+        Вызывать после назначения или снятия ролей пользователей user_ids.
+        Увеличивает их User.roles_version (ключ кеша прав) и updated_at
+        (по нему воркеры сбрасывают кеш токенов этих пользователей) и
+        версию списка назначений (ETag /api/permissions/user-roles/).
+        """
+        now = timezone.now()
+        for chunk in cls._chunks(set(user_ids), settings.ROLE_BULK_BATCH_SIZE):
+            User.objects.filter(id__in=chunk).update(
+                roles_version=F('roles_version') + 1, updated_at=now
+            )
+        version_tracker.bump(USER_ROLES_VERSION)
+
+    @staticmethod
+    @timed('permissions')
+    def get_user_permissions(user: User) -> dict:
+        """
+        Получить все права пользователя.
+        Результат кешируется по (user_id, версия ролей пользователя, версия правил).
+        """
+        key = (user.id, user.roles_version, version_tracker.get(permission_matrix.VERSION_KEY))
+        permissions = permissions_cache.get(key)
+        if permissions is None:
+            role_ids = [role.id for role in user.get_roles()]
+            permissions = permission_matrix.effective(permission_matrix.masks(), role_ids)
+            permissions_cache.set(key, permissions)
+        return {code: dict(actions) for code, actions in permissions.items()}
+
+    # Асинхронные версии для ASGI (config/asgi.py)
+
+    @staticmethod
+    @timed('permissions')
+    async def acheck_permission(user: User, resource_code: str, action: str, is_owner: bool = False) -> bool:
+        """Асинхронная версия check_permission."""
+        role_ids = [role.id for role in await user.aget_roles()]
+        return await permission_matrix.acheck(role_ids, resource_code, action, is_owner)
+
+    @staticmethod
+    @timed('permissions')
+    async def aget_user_permissions(user: User) -> dict:
+        """Асинхронная версия get_user_permissions."""
+        key = (user.id, user.roles_version, await version_tracker.aget(permission_matrix.VERSION_KEY))
+        permissions = permissions_cache.get(key)
+        if permissions is None:
+            role_ids = [role.id for role in await user.aget_roles()]
+            permissions = permission_matrix.effective(await permission_matrix.amasks(), role_ids)
+            permissions_cache.set(key, permissions)
+        return {code: dict(actions) for code, actions in permissions.items()}
@@ -0,0 +1,58 @@
+"""
+Потоковая выгрузка списков в формате NDJSON (один JSON-объект на строку).
+
+Строки читаются через queryset.iterator(chunk_size) - на PostgreSQL это
+серверный курсор, - сериализуются и отдаются клиенту пачками, поэтому
+память воркера не растет с размером таблицы.
+
+Под ASGI синхронный итератор Django целиком собирает в список перед
+отправкой, поэтому для ASGI-запросов отдается асинхронный итератор
+поверх queryset.aiterator(chunk_size).
+"""
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def _encoder():
+    return JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _ndjson_chunks(queryset, to_dict, chunk_size: int):
+    encode = _encoder()
+    lines = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        lines.append(encode(to_dict(obj)))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+async def _andjson_chunks(queryset, to_dict, chunk_size: int):
+    encode = _encoder()
+    lines = []
+    async for obj in queryset.aiterator(chunk_size=chunk_size):
+        lines.append(encode(to_dict(obj)))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def stream_ndjson(request, queryset, to_dict, chunk_size: int = None) -> StreamingHttpResponse:
+    """
+    Ответ NDJSON со всеми строками queryset (порядок задает вызывающий).
+    to_dict превращает строку в dict, например permission_row.
+    request - запрос Django или DRF, по нему выбирается итератор.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    http_request = getattr(request, '_request', request)
+    chunks = _andjson_chunks if isinstance(http_request, ASGIRequest) else _ndjson_chunks
+    return StreamingHttpResponse(
+        chunks(queryset, to_dict, chunk_size),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
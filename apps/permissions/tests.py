@@ -0,0 +1,110 @@
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from apps.users.models import User
+from .cache import permissions_cache
+from .models import ACTION_BITS, Permission, Resource, Role, UserRole
+from .services import PermissionService
+from .serializers import (
+    PermissionSerializer, RoleSerializer, UserRoleSerializer,
+    PERMISSION_VALUES, ROLE_VALUES, USER_ROLE_VALUES, permission_row, user_role_row,
+)
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class FastSerializerTests(TestCase):
+    """Строки values() + *_row дают те же байты, что DRF-сериализаторы."""
+
+    @classmethod
+    def setUpTestData(cls):
+        roles = [Role.objects.create(name=f'role-{i}', description=f'Роль «{i}»') for i in range(3)]
+        resources = [Resource.objects.create(code=f'res-{i}', name=f'Ресурс {i}') for i in range(3)]
+        # Пустая и полная маски и по одному биту на каждое действие
+        masks = [0, sum(ACTION_BITS.values()), *ACTION_BITS.values()]
+        pairs = [(role, resource) for role in roles for resource in resources]
+        for (role, resource), mask in zip(pairs, masks):
+            Permission.objects.create(role=role, resource=resource, actions=mask)
+        for i in range(3):
+            user = User.objects.create(
+                email=f'user{i}@example.com', password_hash='-', first_name='Имя', last_name='Фамилия',
+            )
+            UserRole.objects.create(user=user, role=roles[i])
+
+    def test_permission_row(self):
+        drf = PermissionSerializer(
+            Permission.objects.select_related('role', 'resource').order_by('id'), many=True
+        ).data
+        fast = [permission_row(row) for row in Permission.objects.order_by('id').values(*PERMISSION_VALUES)]
+        self.assertTrue(fast)
+        self.assertEqual(render(fast), render(drf))
+
+    def test_permission_flags_cover_every_bit(self):
+        for action, bit in ACTION_BITS.items():
+            permission = Permission(actions=bit)
+            row = {
+                'id': 1, 'role_id': 1, 'role__name': 'r', 'resource_id': 1,
+                'resource__code': 'c', 'actions': bit,
+            }
+            data = permission_row(row)
+            self.assertTrue(data[f'can_{action}'])
+            self.assertEqual(sum(data[f'can_{name}'] for name in ACTION_BITS), 1)
+            self.assertTrue(getattr(permission, f'can_{action}'))
+
+    def test_user_role_row(self):
+        drf = UserRoleSerializer(
+            UserRole.objects.select_related('user', 'role').order_by('id'), many=True
+        ).data
+        fast = [user_role_row(row) for row in UserRole.objects.order_by('id').values(*USER_ROLE_VALUES)]
+        self.assertEqual(render(fast), render(drf))
+
+    def test_role_values(self):
+        drf = RoleSerializer(Role.objects.order_by('id'), many=True).data
+        fast = list(Role.objects.order_by('id').values(*ROLE_VALUES))
+        self.assertEqual(render(fast), render(drf))
+
+
+class RolesVersionTests(TestCase):
+    """Назначение роли сбрасывает кеш прав только затронутого пользователя."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = Role.objects.create(name='reader')
+        cls.writer = Role.objects.create(name='writer')
+        resource = Resource.objects.create(code='docs', name='Документы')
+        Permission.objects.create(role=cls.reader, resource=resource, actions=ACTION_BITS['read'])
+        Permission.objects.create(role=cls.writer, resource=resource, actions=ACTION_BITS['create'])
+        cls.alice = User.objects.create(email='alice@example.com', password_hash='-', first_name='А', last_name='А')
+        cls.bob = User.objects.create(email='bob@example.com', password_hash='-', first_name='Б', last_name='Б')
+        for user in (cls.alice, cls.bob):
+            UserRole.objects.create(user=user, role=cls.reader)
+
+    def setUp(self):
+        # Матрица прав перестраивается по правилам этого теста
+        PermissionService.rules_changed()
+        permissions_cache.clear()
+
+    def permissions(self, user):
+        return PermissionService.get_user_permissions(User.objects.get(pk=user.pk))['docs']
+
+    def test_grant_bumps_only_granted_user(self):
+        self.assertFalse(self.permissions(self.alice)['create'])
+        self.assertFalse(self.permissions(self.bob)['create'])
+
+        statuses = PermissionService.grant_roles([(self.alice.id, self.writer.id)])
+        self.assertEqual(statuses, ['created'])
+        self.assertEqual(User.objects.get(pk=self.alice.pk).roles_version, 1)
+        self.assertEqual(User.objects.get(pk=self.bob.pk).roles_version, 0)
+
+        hits = permissions_cache.stats()['hits']
+        self.assertTrue(self.permissions(self.alice)['create'])
+        self.assertFalse(self.permissions(self.bob)['create'])
+        # Запись bob пережила назначение роли alice
+        self.assertEqual(permissions_cache.stats()['hits'], hits + 1)
+
+    def test_revoke_bumps_only_revoked_user(self):
+        PermissionService.revoke_roles([(self.bob.id, self.reader.id), (self.bob.id, self.writer.id)])
+        self.assertEqual(User.objects.get(pk=self.alice.pk).roles_version, 0)
+        self.assertEqual(User.objects.get(pk=self.bob.pk).roles_version, 1)
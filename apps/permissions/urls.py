@@ -1,8 +1,8 @@
 from django.urls import path
 from .views import (
     RoleListView, ResourceListView, PermissionListView,
-    PermissionDetailView, UserRoleListView, UserRoleDeleteView,
-    MyPermissionsView
+    PermissionDetailView, UserRoleListView, UserRoleBulkView, UserRoleDeleteView,
+    MyPermissionsView, PermissionCheckView
 )
 
 urlpatterns = [
@@ -11,6 +11,8 @@ urlpatterns = [
     path('rules/', PermissionListView.as_view(), name='permissions'),
     path('rules/<int:pk>/', PermissionDetailView.as_view(), name='permission-detail'),
     path('user-roles/', UserRoleListView.as_view(), name='user-roles'),
+    path('user-roles/bulk/', UserRoleBulkView.as_view(), name='user-roles-bulk'),
     path('user-roles/<int:pk>/', UserRoleDeleteView.as_view(), name='user-role-delete'),
     path('my/', MyPermissionsView.as_view(), name='my-permissions'),
+    path('check/', PermissionCheckView.as_view(), name='permission-check'),
 ]
@@ -0,0 +1,55 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .models import Version
+
+# Ключи версий. Каждый увеличивается при изменении соответствующих данных.
+RULES_VERSION = 'rules'            # правила доступа (Permission)
+USER_ROLES_VERSION = 'user_roles'  # список назначений ролей; у пользователя - User.roles_version
+ROLES_VERSION = 'roles'
+RESOURCES_VERSION = 'resources'
+USERS_VERSION = 'users'            # новые пользователи (и их роль по умолчанию)
+
+
+class VersionTracker:
+    """
+    Локальная копия счетчиков Version внутри процесса.
+    Сверяется с БД (один запрос за все ключи) не чаще раза в interval секунд.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._values = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _stale(self) -> bool:
+        return self._values is None or time.monotonic() - self._checked >= self.interval
+
+    def get(self, key: str) -> int:
+        if self._stale():
+            self._store(Version.objects.values_list('key', 'value'))
+        return self._values.get(key, 0)
+
+    async def aget(self, key: str) -> int:
+        if self._stale():
+            self._store([row async for row in Version.objects.values_list('key', 'value')])
+        return self._values.get(key, 0)
+
+    def _store(self, rows):
+        values = dict(rows)
+        with self._lock:
+            self._values = values
+            self._checked = time.monotonic()
+
+    def bump(self, key: str):
+        """Увеличить версию в БД и сразу перечитать ее в этом процессе."""
+        Version.bump(key)
+        self._checked = 0.0
+
+
+version_tracker = VersionTracker(
+    interval=getattr(settings, 'PERMISSION_VERSION_CHECK_SECONDS', 1),
+)
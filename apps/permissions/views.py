@@ -1,30 +1,52 @@
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from .models import Role, UserRole, Resource, Permission
 from .serializers import (
-    RoleSerializer, ResourceSerializer, PermissionSerializer,
-    PermissionUpdateSerializer, UserRoleSerializer, AssignRoleSerializer
+    ResourceSerializer, PermissionSerializer,
+    PermissionUpdateSerializer, UserRoleSerializer, AssignRoleSerializer, BulkRoleSerializer,
+    PermissionCheckSerializer, ROLE_VALUES, PERMISSION_VALUES, USER_ROLE_VALUES,
+    permission_row, user_role_row
 )
 from .services import PermissionService
+from .decorators import conditional_get
+from .pagination import paginate, PaginationError
+from .streaming import stream_ndjson
+from .versions import (
+    RULES_VERSION, USER_ROLES_VERSION, ROLES_VERSION, RESOURCES_VERSION, USERS_VERSION
+)
+from apps.auth_app.cache import token_cache
 from apps.auth_app.decorators import login_required, admin_required
 from apps.users.models import User
 
 
+def paginated_list(data, next_cursor) -> Response:
+    """
+    Страница списка. Тело остается массивом, как до пагинации,
+    курсор следующей страницы передается в заголовке X-Next-Cursor.
+    """
+    response = Response(data)
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
+
 class RoleListView(APIView):
     """Список ролей (только для админа)."""
 
     @admin_required
+    @conditional_get(ROLES_VERSION)
     def get(self, request):
-        roles = Role.objects.all()
-        return Response(RoleSerializer(roles, many=True).data)
+        return Response(list(Role.objects.values(*ROLE_VALUES)))
 
 
 class ResourceListView(APIView):
     """Список ресурсов (только для админа)."""
 
     @admin_required
+    @conditional_get(RESOURCES_VERSION)
     def get(self, request):
         resources = Resource.objects.all()
         return Response(ResourceSerializer(resources, many=True).data)
@@ -34,9 +56,17 @@ class PermissionListView(APIView):
     """Список всех прав доступа (только для админа)."""
 
     @admin_required
+    @conditional_get(RULES_VERSION, ROLES_VERSION, RESOURCES_VERSION)
     def get(self, request):
-        permissions = Permission.objects.select_related('role', 'resource').all()
-        return Response(PermissionSerializer(permissions, many=True).data)
+        if request.GET.get('export') == 'stream':
+            return stream_ndjson(
+                request, Permission.objects.order_by('id').values(*PERMISSION_VALUES), permission_row
+            )
+        try:
+            rows, next_cursor = paginate(request, Permission.objects.values(*PERMISSION_VALUES))
+        except PaginationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return paginated_list([permission_row(row) for row in rows], next_cursor)
 
 
 class PermissionDetailView(APIView):
@@ -62,6 +92,7 @@ class PermissionDetailView(APIView):
         for field, value in serializer.validated_data.items():
             setattr(permission, field, value)
         permission.save()
+        PermissionService.rules_changed()
 
         return Response(PermissionSerializer(permission).data)
 
@@ -70,9 +101,17 @@ class UserRoleListView(APIView):
     """Список назначений ролей пользователям (только для админа)."""
 
     @admin_required
+    @conditional_get(USER_ROLES_VERSION, USERS_VERSION, ROLES_VERSION)
     def get(self, request):
-        user_roles = UserRole.objects.select_related('user', 'role').all()
-        return Response(UserRoleSerializer(user_roles, many=True).data)
+        if request.GET.get('export') == 'stream':
+            return stream_ndjson(
+                request, UserRole.objects.order_by('id').values(*USER_ROLE_VALUES), user_role_row
+            )
+        try:
+            rows, next_cursor = paginate(request, UserRole.objects.values(*USER_ROLE_VALUES))
+        except PaginationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return paginated_list([user_role_row(row) for row in rows], next_cursor)
 
     @admin_required
     def post(self, request):
@@ -89,13 +128,56 @@ class UserRoleListView(APIView):
         if not role:
             return Response({'error': 'Роль не найдена'}, status=status.HTTP_404_NOT_FOUND)
 
-        user_role, created = UserRole.objects.get_or_create(user=user, role=role)
+        with transaction.atomic():
+            user_role, created = UserRole.objects.get_or_create(user=user, role=role)
+            if created:
+                PermissionService.roles_changed([user.id])
+        # Роли хранятся вместе с пользователем в кеше токенов
+        token_cache.invalidate_user(user.id)
         return Response(
             UserRoleSerializer(user_role).data,
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
         )
 
 
+class UserRoleBulkView(APIView):
+    """Массовое назначение или снятие ролей (только для админа)."""
+
+    @admin_required
+    def post(self, request):
+        """
+        {"action": "grant" | "revoke", "items": [{"user_id": ..., "role_id": ...}, ...]}
+        Ответ: статус каждой пары в том же порядке и количество по статусам.
+        """
+        serializer = BulkRoleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        pairs = [(item['user_id'], item['role_id']) for item in serializer.validated_data['items']]
+        if serializer.validated_data['action'] == 'grant':
+            statuses = PermissionService.grant_roles(pairs)
+            changed = 'created'
+        else:
+            statuses = PermissionService.revoke_roles(pairs)
+            changed = 'revoked'
+
+        # Версии ролей пользователей сервис увеличил в той же транзакции
+        changed_users = {user_id for (user_id, _), result in zip(pairs, statuses) if result == changed}
+        for user_id in changed_users:
+            token_cache.invalidate_user(user_id)
+
+        summary = {}
+        for result in statuses:
+            summary[result] = summary.get(result, 0) + 1
+        return Response({
+            'results': [
+                {'user_id': user_id, 'role_id': role_id, 'status': result}
+                for (user_id, role_id), result in zip(pairs, statuses)
+            ],
+            'summary': summary,
+        })
+
+
 class UserRoleDeleteView(APIView):
     """Удаление роли у пользователя (только для админа)."""
 
@@ -104,7 +186,10 @@ class UserRoleDeleteView(APIView):
         user_role = UserRole.objects.filter(pk=pk).first()
         if not user_role:
             return Response({'error': 'Назначение не найдено'}, status=status.HTTP_404_NOT_FOUND)
-        user_role.delete()
+        with transaction.atomic():
+            user_role.delete()
+            PermissionService.roles_changed([user_role.user_id])
+        token_cache.invalidate_user(user_role.user_id)
         return Response({'message': 'Роль удалена у пользователя'})
 
 
@@ -112,6 +197,7 @@ class MyPermissionsView(APIView):
     """Получить свои права доступа."""
 
     @login_required
+    @conditional_get(RULES_VERSION, per_user=True)
     def get(self, request):
         permissions = PermissionService.get_user_permissions(request.user)
         return Response({
@@ -119,3 +205,19 @@ class MyPermissionsView(APIView):
             'roles': [r.name for r in request.user.get_roles()],
             'permissions': permissions
         })
+
+
+class PermissionCheckView(APIView):
+    """Пакетная проверка своих прав: список (resource_code, action, is_owner)."""
+
+    @login_required
+    def post(self, request):
+        serializer = PermissionCheckSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        checks = [
+            (item['resource_code'], item['action'], item['is_owner'])
+            for item in serializer.validated_data['checks']
+        ]
+        return Response({'results': PermissionService.check_many(request.user, checks)})
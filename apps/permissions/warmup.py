@@ -0,0 +1,82 @@
+"""
+Прогрев процесса перед обслуживанием запросов.
+
+Запускается из PermissionsConfig.ready() при WARMUP_ON_STARTUP=True
+или командой manage.py warmup.
+"""
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def warm_db():
+    """Открыть соединение с БД."""
+    from django.db import connection
+    connection.ensure_connection()
+
+
+def warm_permissions():
+    """Загрузить роли, ресурсы и скомпилировать матрицу прав."""
+    from .models import Role, Resource
+    from .matrix import permission_matrix
+    list(Role.objects.all())
+    list(Resource.objects.all())
+    permission_matrix.rebuild()
+
+
+def warm_serializers():
+    """Построить поля сериализаторов и кеши _meta моделей."""
+    from apps.users.models import User
+    from apps.users.serializers import user_data
+    from .models import Permission, Role, Resource
+    from .serializers import PermissionSerializer
+
+    user = User(email='warmup@example.com', first_name='', last_name='')
+    user.set_roles([])
+    user_data(user)
+    PermissionSerializer(
+        Permission(role=Role(name='warmup'), resource=Resource(code='warmup'))
+    ).data
+
+
+ROUTE_PARAM = re.compile(r'<(?:\w+:)?\w+>')
+
+
+def warm_urls():
+    """Заполнить URL resolver и разрешить каждый маршрут."""
+    from django.urls import get_resolver, resolve, URLResolver
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, route)
+            else:
+                yield route
+
+    count = 0
+    for route in walk(get_resolver().url_patterns, ''):
+        resolve('/' + ROUTE_PARAM.sub('1', route))
+        count += 1
+    return count
+
+
+STEPS = [
+    ('db', warm_db),
+    ('permissions', warm_permissions),
+    ('serializers', warm_serializers),
+    ('urls', warm_urls),
+]
+
+
+def run() -> dict:
+    """Выполнить все шаги. Возвращает {шаг: время в секундах}."""
+    timings = {}
+    for name, step in STEPS:
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+        logger.info('Прогрев %s: %.1f мс', name, timings[name] * 1000)
+    return timings
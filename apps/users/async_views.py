@@ -0,0 +1,69 @@
+from asgiref.sync import sync_to_async
+from django.views import View
+from rest_framework import status
+
+from .serializers import UserCreateSerializer, UserUpdateSerializer, user_data
+from .services import UserService
+from apps.auth_app.cache import token_cache
+from apps.auth_app.decorators import alogin_required, ahashing_backpressure
+from apps.auth_app.responses import json_response, parse_json
+from apps.auth_app.services import AuthService
+
+
+class RegisterAsyncView(View):
+    """Регистрация нового пользователя (ASGI)."""
+
+    @ahashing_backpressure
+    async def post(self, request):
+        data, error = parse_json(request)
+        if error:
+            return error
+        serializer = UserCreateSerializer(data=data)
+        # validate() проверяет уникальность email запросом к БД
+        if not await sync_to_async(serializer.is_valid)():
+            return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        user = await UserService.acreate_user(
+            email=data['email'],
+            password=data['password'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            patronymic=data.get('patronymic')
+        )
+        return json_response(user_data(user), status=status.HTTP_201_CREATED)
+
+
+class ProfileAsyncView(View):
+    """Профиль текущего пользователя (ASGI)."""
+
+    @alogin_required
+    async def get(self, request):
+        """Получить свой профиль."""
+        user = await request.auser()
+        await user.aget_roles()
+        return json_response(user_data(user))
+
+    @alogin_required
+    @ahashing_backpressure
+    async def patch(self, request):
+        """Обновить свой профиль."""
+        data, error = parse_json(request)
+        if error:
+            return error
+        serializer = UserUpdateSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user = await UserService.aupdate_user(await request.auser(), **serializer.validated_data)
+        token_cache.invalidate_user(user.id)
+        await user.aget_roles()
+        return json_response(user_data(user))
+
+    @alogin_required
+    async def delete(self, request):
+        """Мягкое удаление аккаунта."""
+        user = await request.auser()
+        await AuthService.alogout_all(user)
+        await UserService.asoft_delete(user)
+        return json_response({'message': 'Аккаунт деактивирован'}, status=status.HTTP_200_OK)
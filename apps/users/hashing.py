@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from django.conf import settings
+
+from apps.monitoring.timing import stage
+
+
+class HasherBusy(Exception):
+    """Очередь хеширования переполнена."""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Очередь хеширования паролей переполнена')
+        self.retry_after = retry_after
+
+
+class PasswordHasherPool:
+    """
+    Пул потоков для bcrypt с ограниченной очередью.
+
+    bcrypt отпускает GIL, поэтому хеширование идет параллельно, но не
+    больше чем в workers потоках. Если в очереди уже queue_size задач,
+    новая задача сразу отклоняется с HasherBusy.
+    """
+
+    def __init__(self, workers: int, queue_size: int, retry_after: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    def hash_password(self, password: str) -> str:
+        return self._run(bcrypt.hashpw, password.encode(), bcrypt.gensalt()).decode()
+
+    def verify_password(self, password: str, password_hash: str) -> bool:
+        return self._run(bcrypt.checkpw, password.encode(), password_hash.encode())
+
+    async def ahash_password(self, password: str) -> str:
+        """Асинхронная версия: event loop не блокируется на bcrypt."""
+        return (await self._arun(bcrypt.hashpw, password.encode(), bcrypt.gensalt())).decode()
+
+    async def averify_password(self, password: str, password_hash: str) -> bool:
+        return await self._arun(bcrypt.checkpw, password.encode(), password_hash.encode())
+
+    def _run(self, func, *args):
+        future = self._submit(func, *args)
+        with stage('bcrypt'):
+            return future.result()
+
+    async def _arun(self, func, *args):
+        future = self._submit(func, *args)
+        with stage('bcrypt'):
+            return await asyncio.wrap_future(future)
+
+    def _submit(self, func, *args):
+        """
+        Занять место в очереди и отправить задачу в пул. Место освобождается,
+        когда задача завершилась или отменена до запуска, а не когда вызвавший
+        перестал ждать: отмена запроса (клиент отключился) не должна пускать
+        в пул больше workers + queue_size задач.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy(self.retry_after)
+        with self._lock:
+            self.in_flight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='bcrypt'
+                )
+        try:
+            future = self._executor.submit(self._timed, func, time.perf_counter(), *args)
+        except BaseException:
+            self._done()
+            raise
+        future.add_done_callback(lambda f: self._done())
+        return future
+
+    def _done(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _timed(self, func, submitted_at, *args):
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self.wait_seconds_total += started - submitted_at
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.hash_seconds_total += elapsed
+                self.hash_seconds_max = max(self.hash_seconds_max, elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'queue_depth': self.in_flight - self.running,
+                'running': self.running,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'hash_seconds_total': self.hash_seconds_total,
+                'hash_seconds_max': self.hash_seconds_max,
+                'wait_seconds_total': self.wait_seconds_total,
+            }
+
+
+password_hasher = PasswordHasherPool(
+    workers=getattr(settings, 'PASSWORD_HASH_WORKERS', 2),
+    queue_size=getattr(settings, 'PASSWORD_HASH_QUEUE_SIZE', 16),
+    retry_after=getattr(settings, 'PASSWORD_HASH_RETRY_AFTER', 1),
+)
@@ -0,0 +1,11 @@
+"""
+Хеширование паролей в дочерних процессах импорта.
+
+Модуль не импортирует Django: процессы запускаются через spawn и
+загружают только его, без настроек и моделей.
+"""
+import bcrypt
+
+
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
@@ -0,0 +1,248 @@
+"""
+Массовый импорт пользователей из CSV или JSONL.
+
+Файл читается построчно, пароли хешируются bcrypt в пуле процессов на
+всех ядрах, пользователи и роль user по умолчанию вставляются пачками
+bulk_create. Пока пачка вставляется, следующая уже хешируется.
+Процессы запускаются через spawn: fork из процесса с потоками (пул
+bcrypt, очистка сессий) может зависнуть на унаследованной блокировке.
+В веб-запросе (in_process=True) пароли хешируются в общем ограниченном
+пуле password_hasher.
+Ошибки собираются по строкам, после каждой вставленной пачки можно
+сохранить контрольную точку и продолжить импорт с нее.
+"""
+import csv
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.db import transaction
+
+from . import hashworker
+from .hashing import password_hasher
+from .models import User
+from .serializers import UserImportRowSerializer
+
+FORMATS = ('csv', 'jsonl')
+
+
+class ImportFileError(Exception):
+    """Файл нельзя читать дальше: не UTF-8 или испорченный CSV. row - номер строки."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(f'Строка {row}: {message}')
+        self.row = row
+
+
+def read_rows(stream, fmt: str):
+    """
+    Строки файла как (номер строки, dict). stream - бинарный поток в UTF-8,
+    декодируется построчно, чтобы ошибка кодировки указывала на свою строку.
+    Для CSV первая строка - заголовок, номера считаются с 1 по данным.
+    Некорректная строка JSONL дает None (ошибка этой строки), нечитаемый
+    файл - ImportFileError.
+    """
+    number = 0
+    try:
+        for number, row in _parse((line.decode('utf-8') for line in stream), fmt):
+            yield number, row
+    except UnicodeDecodeError as e:
+        raise ImportFileError(number + 1, 'файл должен быть в кодировке UTF-8') from e
+    except (csv.Error, json.JSONDecodeError) as e:
+        raise ImportFileError(number + 1, f'некорректный формат ({e})') from e
+
+
+def _parse(lines, fmt: str):
+    if fmt == 'csv':
+        yield from enumerate(csv.DictReader(lines), start=1)
+    elif fmt == 'jsonl':
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f'Неизвестный формат: {fmt}')
+
+
+def _error_message(errors) -> str:
+    return '; '.join(
+        f"{field}: {' '.join(str(m) for m in messages)}" for field, messages in errors.items()
+    )
+
+
+class UserImporter:
+    """
+    Импорт пользователей пачками по batch_size строк.
+
+    resume_after - номер последней строки, обработанной в прошлый раз
+    (из контрольной точки); строки до нее включительно пропускаются.
+    in_process - хешировать в password_hasher (может бросить HasherBusy)
+    вместо пула процессов.
+    """
+
+    def __init__(self, batch_size: int, workers: int = None, resume_after: int = 0,
+                 in_process: bool = False):
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.in_process = in_process
+        self.resume_after = resume_after
+        self.last_row = resume_after
+        self.last_read = resume_after
+        self.default_role = None
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []
+        self.elapsed = 0.0
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    @property
+    def rows_per_sec(self) -> float:
+        return (self.imported + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'imported': self.imported,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'last_row': self.last_row,
+            'seconds': self.elapsed,
+            'rows_per_sec': self.rows_per_sec,
+        }
+
+    def run(self, rows, checkpoint=None) -> dict:
+        """
+        Импортировать строки из read_rows().
+        checkpoint(last_row) вызывается после каждой вставленной пачки.
+        """
+        from apps.permissions.models import Role
+
+        started = time.perf_counter()
+        self.default_role = Role.objects.filter(name='user').first()
+        pending = deque()
+        executor, hash_password = self._executor()
+        try:
+            for batch in self._batches(rows):
+                last_row = batch[-1][0]
+                batch = self._unregistered(batch)
+                passwords = [data['password'] for _, data in batch]
+                chunksize = max(1, len(passwords) // (self.workers * 4))
+                hashes = executor.map(hash_password, passwords, chunksize=chunksize)
+                pending.append((batch, last_row, hashes))
+                # Держим одну пачку в хешировании, пока вставляется предыдущая
+                if len(pending) > 1:
+                    self._finish(*pending.popleft(), checkpoint)
+            while pending:
+                self._finish(*pending.popleft(), checkpoint)
+        finally:
+            # При ошибке не ждем хеширования пачек, которые не будут вставлены
+            executor.shutdown(cancel_futures=True)
+        # Хвост файла мог состоять только из строк с ошибками
+        if self.last_read > self.last_row:
+            self.last_row = self.last_read
+            if checkpoint:
+                checkpoint(self.last_row)
+        self.errors.sort(key=lambda error: error['row'])
+        self.elapsed = time.perf_counter() - started
+        return self.stats()
+
+    def _executor(self):
+        """(пул, функция хеширования)."""
+        if self.in_process:
+            workers = min(self.workers, password_hasher.workers)
+            return ThreadPoolExecutor(max_workers=workers), password_hasher.hash_password
+        return (
+            ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            ),
+            hashworker.hash_password,
+        )
+
+    def _batches(self, rows):
+        """Проверенные строки пачками [(номер, данные)]; ошибки проверки - в self.errors."""
+        batch = []
+        for number, row in rows:
+            self.last_read = number
+            if number <= self.resume_after:
+                self.skipped += 1
+                continue
+            if row is None:
+                self._error(number, None, 'Некорректная строка')
+                continue
+            serializer = UserImportRowSerializer(data=row)
+            if not serializer.is_valid():
+                self._error(number, row.get('email'), _error_message(serializer.errors))
+                continue
+            batch.append((number, serializer.validated_data))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _unregistered(self, batch):
+        """Убрать из пачки уже зарегистрированные email (до дорогого хеширования)."""
+        registered = set(User.objects.filter(
+            email__in=[data['email'] for _, data in batch]
+        ).values_list('email', flat=True))
+        new = []
+        for number, data in batch:
+            if data['email'] in registered:
+                self._error(number, data['email'], 'Email уже зарегистрирован')
+            else:
+                new.append((number, data))
+        return new
+
+    def _finish(self, batch, last_row, hashes, checkpoint):
+        """Вставить пачку с готовыми хешами."""
+        from apps.permissions.models import UserRole
+        from apps.permissions.versions import version_tracker, USERS_VERSION
+
+        users = {}
+        # Повтор email внутри файла отсекает уникальный индекс при вставке
+        for (number, data), password_hash in zip(batch, hashes):
+            user = User(
+                email=data['email'],
+                password_hash=password_hash,
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                patronymic=data.get('patronymic') or '',
+            )
+            user.search_text = user.build_search_text()
+            users[number] = user
+
+        with transaction.atomic():
+            # ignore_conflicts: email мог появиться между проверкой и вставкой
+            User.objects.bulk_create(users.values(), ignore_conflicts=True)
+            inserted = set(User.objects.filter(
+                id__in=[user.id for user in users.values()]
+            ).values_list('id', flat=True))
+            if self.default_role:
+                UserRole.objects.bulk_create([
+                    UserRole(user_id=user_id, role=self.default_role) for user_id in inserted
+                ])
+
+        for number, user in users.items():
+            if user.id not in inserted:
+                self._error(number, user.email, 'Email уже зарегистрирован')
+        self.imported += len(inserted)
+        self.last_row = max(self.last_row, last_row)
+        if inserted:
+            # Как UserService.create_user: у новых пользователей нет записей в кешах
+            version_tracker.bump(USERS_VERSION)
+        if checkpoint:
+            checkpoint(self.last_row)
+
+    def _error(self, number, email, message):
+        self.errors.append({'row': number, 'email': email, 'error': message})
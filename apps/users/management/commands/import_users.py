@@ -0,0 +1,102 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.importer import FORMATS, ImportFileError, UserImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Импортирует пользователей из CSV или JSONL (email, password, first_name, last_name, patronymic)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл .csv или .jsonl')
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Формат файла (по умолчанию по расширению)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.USER_IMPORT_BATCH_SIZE,
+            help='Строк в одной пачке вставки'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.USER_IMPORT_WORKERS,
+            help='Процессов для хеширования паролей'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки (по умолчанию <path>.checkpoint)'
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Продолжить с контрольной точки'
+        )
+        parser.add_argument(
+            '--errors',
+            help='Записать ошибки по строкам в файл JSONL'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if fmt not in FORMATS:
+            raise CommandError('Укажите --format csv или --format jsonl')
+        if not os.path.isfile(path):
+            raise CommandError(f'Файл не найден: {path}')
+
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+        source = self._source(path)
+        resume_after = 0
+        if options['resume'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                saved = json.load(f)
+            if saved.get('source') != source:
+                raise CommandError(
+                    f'Контрольная точка {checkpoint_path} записана для другого файла '
+                    f'или файл изменился с тех пор: {saved.get("source")} != {source}'
+                )
+            resume_after = saved['last_row']
+            self.stdout.write(f'Продолжение после строки {resume_after}')
+
+        importer = UserImporter(
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            resume_after=resume_after,
+        )
+
+        def checkpoint(last_row):
+            with open(checkpoint_path, 'w') as f:
+                json.dump({'source': source, 'last_row': last_row}, f)
+            self.stdout.write(
+                f'  Строка {last_row}: импортировано {importer.imported}, ошибок {importer.failed}'
+            )
+
+        with open(path, 'rb') as stream:
+            try:
+                stats = importer.run(read_rows(stream, fmt), checkpoint=checkpoint)
+            except ImportFileError as e:
+                # Пачки до ошибки вставлены и записаны в контрольную точку
+                raise CommandError(f'{e} (импортировано {importer.imported})') from e
+
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as f:
+                for error in importer.errors:
+                    f.write(json.dumps(error, ensure_ascii=False) + '\n')
+        else:
+            for error in importer.errors[:20]:
+                self.stderr.write(f"  Строка {error['row']} ({error['email']}): {error['error']}")
+            if importer.failed > 20:
+                self.stderr.write(f'  ... и еще {importer.failed - 20}, см. --errors')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово! Импортировано: {stats['imported']}, ошибок: {stats['failed']}, "
+            f"пропущено: {stats['skipped']}, {stats['seconds']:.1f} с, "
+            f"{stats['rows_per_sec']:.0f} строк/с"
+        ))
+
+    @staticmethod
+    def _source(path) -> dict:
+        """Что проверяется при --resume: тот же файл и он не менялся."""
+        stat = os.stat(path)
+        return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
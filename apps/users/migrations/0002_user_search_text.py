@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+
+def backfill_search_text(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    batch = []
+    for user in User.objects.only(
+        'id', 'email', 'first_name', 'last_name', 'patronymic'
+    ).iterator(chunk_size=2000):
+        parts = [user.email, user.last_name, user.first_name, user.patronymic]
+        user.search_text = ' '.join(part for part in parts if part).casefold().replace('ё', 'е')
+        batch.append(user)
+        if len(batch) >= 2000:
+            User.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        User.objects.bulk_update(batch, ['search_text'])
+
+
+def create_trigram_index(apps, schema_editor):
+    # Поиск по подстроке (LIKE '%...%') использует индекс только на PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS users_search_text_trgm '
+        'ON users USING gin (search_text gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS users_search_text_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_text',
+            field=models.CharField(default='', editable=False, max_length=600),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_updated_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='roles_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
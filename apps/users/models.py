@@ -2,6 +2,11 @@ import uuid
 from django.db import models
 
 
+def normalize_search(text: str) -> str:
+    """Приведение к виду для поиска: нижний регистр, ё -> е."""
+    return text.casefold().replace('ё', 'е')
+
+
 class User(models.Model):
     """
     Модель пользователя. Не используем встроенную модель Django.
@@ -14,7 +19,14 @@ class User(models.Model):
     patronymic = models.CharField(max_length=100, blank=True, null=True)
     is_active = models.BooleanField(default=True)  # Для мягкого удаления
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Индекс: воркеры догружают измененных пользователей для кеша токенов
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Email и ФИО через пробел после normalize_search; поиск по подстроке
+    # идет по этому столбцу (на PostgreSQL - триграммный GIN индекс)
+    search_text = models.CharField(max_length=600, default='', editable=False)
+    # Увеличивается при назначении и снятии ролей (PermissionService.roles_changed);
+    # входит в ключ кеша прав пользователя
+    roles_version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         db_table = 'users'
@@ -22,6 +34,18 @@ class User(models.Model):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        self.search_text = self.build_search_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'search_text' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'search_text']
+        super().save(*args, **kwargs)
+
+    def build_search_text(self) -> str:
+        """Значение search_text; вызывать перед bulk_create, который не вызывает save()."""
+        parts = [self.email, self.last_name, self.first_name, self.patronymic]
+        return normalize_search(' '.join(part for part in parts if part))
+
     @property
     def full_name(self):
         parts = [self.last_name, self.first_name]
@@ -30,8 +54,28 @@ class User(models.Model):
         return ' '.join(parts)
 
     def get_roles(self):
-        """Получить роли пользователя."""
-        return [ur.role for ur in self.user_roles.select_related('role')]
+        """
+        Получить роли пользователя в порядке назначения (UserRole.id) -
+        так же их упорядочивают AuthService и UserService.load_roles.
+        Результат запоминается на объекте, повторные вызовы не ходят в БД.
+        """
+        roles = self.__dict__.get('_roles')
+        if roles is None:
+            roles = [ur.role for ur in self.user_roles.select_related('role').order_by('id')]
+            self._roles = roles
+        return roles
+
+    async def aget_roles(self):
+        """Асинхронная версия get_roles."""
+        roles = self.__dict__.get('_roles')
+        if roles is None:
+            roles = [ur.role async for ur in self.user_roles.select_related('role').order_by('id')]
+            self._roles = roles
+        return roles
+
+    def set_roles(self, roles):
+        """Установить заранее загруженные роли."""
+        self._roles = list(roles)
 
     def has_role(self, role_name: str) -> bool:
         """Проверить наличие роли."""
@@ -16,6 +16,34 @@ class UserSerializer(serializers.ModelSerializer):
         return [r.name for r in obj.get_roles()]
 
 
+class UserSearchSerializer(serializers.Serializer):
+    """Параметры поиска пользователей (query string)."""
+    q = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    is_active = serializers.BooleanField(required=False)
+    role = serializers.CharField(max_length=50, required=False)
+
+
+_datetime = serializers.DateTimeField()
+
+
+def user_data(user: User) -> dict:
+    """
+    То же, что UserSerializer(user).data, без обхода полей DRF.
+    Роли берутся из user.get_roles() (запоминаются на объекте).
+    """
+    return {
+        'id': str(user.id),
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'patronymic': user.patronymic,
+        'full_name': user.full_name,
+        'is_active': user.is_active,
+        'roles': [role.name for role in user.get_roles()],
+        'created_at': _datetime.to_representation(user.created_at),
+    }
+
+
 class UserCreateSerializer(serializers.Serializer):
     """Сериализатор для регистрации."""
     email = serializers.EmailField()
@@ -33,6 +61,15 @@ class UserCreateSerializer(serializers.Serializer):
         return data
 
 
+class UserImportRowSerializer(serializers.Serializer):
+    """Строка массового импорта пользователей."""
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(min_length=6)
+    first_name = serializers.CharField(max_length=100)
+    last_name = serializers.CharField(max_length=100)
+    patronymic = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+
 class UserUpdateSerializer(serializers.Serializer):
     """Сериализатор для обновления профиля."""
     first_name = serializers.CharField(max_length=100, required=False)
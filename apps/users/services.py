@@ -1,5 +1,7 @@
-import bcrypt
-from .models import User
+from asgiref.sync import sync_to_async
+
+from .models import User, normalize_search
+from .hashing import password_hasher
 
 
 class UserService:
@@ -7,13 +9,13 @@ class UserService:
 
     @staticmethod
     def hash_password(password: str) -> str:
-        """Хеширование пароля с bcrypt."""
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        """Хеширование пароля с bcrypt (в пуле, может бросить HasherBusy)."""
+        return password_hasher.hash_password(password)
 
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
-        """Проверка пароля."""
-        return bcrypt.checkpw(password.encode(), password_hash.encode())
+        """Проверка пароля (в пуле, может бросить HasherBusy)."""
+        return password_hasher.verify_password(password, password_hash)
 
     @classmethod
     def create_user(cls, email: str, password: str, first_name: str, 
@@ -28,9 +30,11 @@ class UserService:
         )
         # Назначаем роль user по умолчанию
         from apps.permissions.models import Role, UserRole
+        from apps.permissions.versions import version_tracker, USERS_VERSION
         default_role = Role.objects.filter(name='user').first()
         if default_role:
             UserRole.objects.create(user=user, role=default_role)
+        version_tracker.bump(USERS_VERSION)
         return user
 
     @classmethod
@@ -47,6 +51,37 @@ class UserService:
         user.save()
         return user
 
+    @staticmethod
+    def search(query: str = '', is_active: bool = None, role: str = None):
+        """
+        Пользователи, у которых query входит в email или ФИО (без учета
+        регистра), с фильтрами по активности и имени роли.
+        """
+        users = User.objects.all()
+        query = normalize_search(query.strip())
+        if query:
+            users = users.filter(search_text__contains=query)
+        if is_active is not None:
+            users = users.filter(is_active=is_active)
+        if role:
+            users = users.filter(user_roles__role__name=role)
+        return users
+
+    @staticmethod
+    def load_roles(users) -> list:
+        """
+        Загрузить роли списка пользователей одним запросом
+        (вместо запроса на каждого в get_roles).
+        """
+        from apps.permissions.models import UserRole
+        users = list(users)
+        roles = {user.id: [] for user in users}
+        for user_role in UserRole.objects.filter(user_id__in=roles).select_related('role').order_by('id'):
+            roles[user_role.user_id].append(user_role.role)
+        for user in users:
+            user.set_roles(roles[user.id])
+        return users
+
     @staticmethod
     def soft_delete(user: User) -> User:
         """Мягкое удаление пользователя."""
@@ -58,3 +93,50 @@ class UserService:
     def get_by_email(email: str) -> User | None:
         """Получить пользователя по email."""
         return User.objects.filter(email=email, is_active=True).first()
+
+    # Асинхронные версии для ASGI (config/asgi.py)
+
+    @classmethod
+    async def acreate_user(cls, email: str, password: str, first_name: str,
+                           last_name: str, patronymic: str = None) -> User:
+        """Асинхронное создание пользователя."""
+        from apps.permissions.models import Role, UserRole
+        from apps.permissions.versions import version_tracker, USERS_VERSION
+        user = await User.objects.acreate(
+            email=email,
+            password_hash=await password_hasher.ahash_password(password),
+            first_name=first_name,
+            last_name=last_name,
+            patronymic=patronymic or ''
+        )
+        default_role = await Role.objects.filter(name='user').afirst()
+        if default_role:
+            await UserRole.objects.acreate(user=user, role=default_role)
+        await sync_to_async(version_tracker.bump)(USERS_VERSION)
+        user.set_roles([default_role] if default_role else [])
+        return user
+
+    @classmethod
+    async def aupdate_user(cls, user: User, **kwargs) -> User:
+        """Асинхронное обновление данных пользователя."""
+        if 'password' in kwargs:
+            user.password_hash = await password_hasher.ahash_password(kwargs.pop('password'))
+            kwargs.pop('password_confirm', None)
+
+        for field, value in kwargs.items():
+            if hasattr(user, field) and value is not None:
+                setattr(user, field, value)
+
+        await user.asave()
+        return user
+
+    @staticmethod
+    async def asoft_delete(user: User) -> User:
+        """Асинхронное мягкое удаление."""
+        user.is_active = False
+        await user.asave()
+        return user
+
+    @staticmethod
+    async def aget_by_email(email: str) -> User | None:
+        return await User.objects.filter(email=email, is_active=True).afirst()
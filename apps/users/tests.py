@@ -0,0 +1,111 @@
+import asyncio
+import functools
+import threading
+import uuid
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.auth_app.cache import token_cache, token_digest
+from apps.auth_app.models import Session
+from apps.auth_app.services import AuthService
+from apps.permissions.models import Role, UserRole
+from .hashing import HasherBusy, PasswordHasherPool
+from .models import User
+from .serializers import UserSerializer, user_data
+from .services import UserService
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class UserDataTests(TestCase):
+    """user_data() дает те же байты, что UserSerializer, на всех путях загрузки ролей."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Роли назначены не в порядке их id: manager, затем admin
+        cls.admin = Role.objects.create(name='admin')
+        cls.manager = Role.objects.create(name='manager')
+        cls.user = User.objects.create(
+            email='Ёлкин@example.com', password_hash='-',
+            first_name='Пётр', last_name='Ёлкин', patronymic='',
+        )
+        UserRole.objects.create(user=cls.user, role=cls.manager)
+        UserRole.objects.create(user=cls.user, role=cls.admin)
+
+    def setUp(self):
+        token_cache.clear()
+
+    def login(self) -> str:
+        session_id = uuid.uuid4()
+        token = AuthService.generate_token(self.user, jti=str(session_id))
+        Session.objects.create(
+            id=session_id, user=self.user, token_hash=token_digest(token),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        return token
+
+    def assertParity(self, user):
+        self.assertEqual(render(user_data(user)), render(UserSerializer(user).data))
+
+    def test_roles_in_assignment_order(self):
+        expected = ['manager', 'admin']
+        fresh = User.objects.get(pk=self.user.pk)
+        self.assertEqual([role.name for role in fresh.get_roles()], expected)
+
+        [loaded] = UserService.load_roles(User.objects.filter(pk=self.user.pk))
+        self.assertEqual([role.name for role in loaded.get_roles()], expected)
+
+        by_token = AuthService.get_user_by_token(self.login())
+        self.assertEqual([role.name for role in by_token.get_roles()], expected)
+
+        stateless = AuthService._load_user(str(self.user.pk))
+        self.assertEqual([role.name for role in stateless.get_roles()], expected)
+
+    def test_parity_fresh_user(self):
+        self.assertParity(User.objects.get(pk=self.user.pk))
+
+    def test_parity_load_roles(self):
+        [user] = UserService.load_roles(User.objects.filter(pk=self.user.pk))
+        self.assertParity(user)
+
+    def test_parity_user_by_token(self):
+        self.assertParity(AuthService.get_user_by_token(self.login()))
+
+    def test_parity_null_patronymic_and_no_roles(self):
+        user = User.objects.create(
+            email='plain@example.com', password_hash='-',
+            first_name='Анна', last_name='Смирнова', patronymic=None,
+        )
+        self.assertParity(User.objects.get(pk=user.pk))
+
+    @override_settings(USE_TZ=True, TIME_ZONE='Europe/Moscow')
+    def test_parity_created_at_timezone(self):
+        self.assertParity(User.objects.get(pk=self.user.pk))
+
+
+class PasswordHasherPoolTests(SimpleTestCase):
+    """Отмена ожидающего запроса не освобождает место, пока задача идет в пуле."""
+
+    def test_cancelled_caller_keeps_slot_until_task_finishes(self):
+        pool = PasswordHasherPool(workers=1, queue_size=0, retry_after=1)
+        release = threading.Event()
+        wait = functools.partial(release.wait, 5)
+
+        async def scenario():
+            task = asyncio.create_task(pool._arun(wait))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            with self.assertRaises(HasherBusy):
+                await pool._arun(wait)
+            release.set()
+            await asyncio.sleep(0.05)
+            self.assertTrue(await pool._arun(wait))
+
+        asyncio.run(scenario())
+        self.assertEqual(pool.stats()['rejected'], 1)
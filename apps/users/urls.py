@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import RegisterView, ProfileView
+from .views import UserListView, UserImportView, RegisterView, ProfileView
 
 urlpatterns = [
+    path('', UserListView.as_view(), name='users'),
+    path('import/', UserImportView.as_view(), name='user-import'),
     path('register/', RegisterView.as_view(), name='register'),
     path('profile/', ProfileView.as_view(), name='profile'),
 ]
@@ -1,16 +1,115 @@
+import os
+
+from django.conf import settings
+from rest_framework.parsers import MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from .models import User
-from .serializers import UserSerializer, UserCreateSerializer, UserUpdateSerializer
+from .serializers import (
+    UserCreateSerializer, UserUpdateSerializer, UserSearchSerializer, user_data
+)
 from .services import UserService
-from apps.auth_app.decorators import login_required
+from apps.auth_app.decorators import login_required, admin_required, hashing_backpressure
+from apps.permissions.pagination import paginate, PaginationError
+from .hashing import HasherBusy
+from .importer import FORMATS, ImportFileError, UserImporter, read_rows
+
+
+class UserListView(APIView):
+    """Список пользователей с поиском (только для админа)."""
+
+    @admin_required
+    def get(self, request):
+        """
+        ?q= - подстрока email или ФИО, ?is_active=true|false, ?role=<имя роли>.
+        Страницы в порядке email, роли страницы загружаются одним запросом.
+        """
+        serializer = UserSearchSerializer(data=request.GET.dict())
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        users = UserService.search(
+            params.get('q', ''), params.get('is_active'), params.get('role')
+        )
+        try:
+            users, next_cursor = paginate(request, users, key='email')
+        except PaginationError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        UserService.load_roles(users)
+        return Response({
+            'users': [user_data(user) for user in users],
+            'next_cursor': next_cursor,
+        })
+
+
+class UserImportView(APIView):
+    """Массовый импорт пользователей из файла (только для админа)."""
+    parser_classes = [MultiPartParser]
+
+    @admin_required
+    def post(self, request):
+        """
+        multipart-поле file с CSV или JSONL; формат по ?format= или расширению.
+        Не больше USER_IMPORT_MAX_ROWS строк: пароли хешируются в общем пуле
+        bcrypt внутри запроса, большие файлы - через manage.py import_users.
+        ?resume_after=<last_row> продолжает прерванный импорт того же файла.
+        Ответ: счетчики импорта (last_row - контрольная точка) и ошибки по строкам.
+        """
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'Нужен файл в поле file'}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.GET.get('format') or os.path.splitext(upload.name)[1].lstrip('.').lower()
+        if fmt not in FORMATS:
+            return Response({'error': 'Формат должен быть csv или jsonl'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            resume_after = max(0, int(request.GET.get('resume_after', 0)))
+        except ValueError:
+            return Response({'error': 'resume_after должен быть числом'}, status=status.HTTP_400_BAD_REQUEST)
+
+        too_large = Response(
+            {'error': f'Не больше {settings.USER_IMPORT_MAX_ROWS} строк и '
+                      f'{settings.USER_IMPORT_MAX_UPLOAD_BYTES} байт, используйте import_users'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        if upload.size > settings.USER_IMPORT_MAX_UPLOAD_BYTES:
+            return too_large
+        rows = []
+        try:
+            for number, row in read_rows(upload.file, fmt):
+                if number > settings.USER_IMPORT_MAX_ROWS:
+                    return too_large
+                rows.append((number, row))
+        except ImportFileError as e:
+            return Response({'error': str(e), 'row': e.row}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = UserImporter(
+            batch_size=settings.USER_IMPORT_BATCH_SIZE,
+            workers=settings.USER_IMPORT_WORKERS,
+            resume_after=resume_after,
+            in_process=True,
+        )
+        try:
+            stats = importer.run(rows)
+        except HasherBusy as e:
+            # Вставленные пачки остаются, продолжить можно с last_row
+            importer.errors.sort(key=lambda error: error['row'])
+            return Response(
+                {'error': 'Сервер перегружен, повторите запрос позже',
+                 **importer.stats(), 'errors': importer.errors},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(e.retry_after)},
+            )
+        return Response({**stats, 'errors': importer.errors})
 
 
 class RegisterView(APIView):
     """Регистрация нового пользователя."""
 
+    @hashing_backpressure
     def post(self, request):
         serializer = UserCreateSerializer(data=request.data)
         if not serializer.is_valid():
@@ -24,7 +123,7 @@ class RegisterView(APIView):
             last_name=data['last_name'],
             patronymic=data.get('patronymic')
         )
-        return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
+        return Response(user_data(user), status=status.HTTP_201_CREATED)
 
 
 class ProfileView(APIView):
@@ -33,9 +132,10 @@ class ProfileView(APIView):
     @login_required
     def get(self, request):
         """Получить свой профиль."""
-        return Response(UserSerializer(request.user).data)
+        return Response(user_data(request.user))
 
     @login_required
+    @hashing_backpressure
     def patch(self, request):
         """Обновить свой профиль."""
         serializer = UserUpdateSerializer(data=request.data)
@@ -43,14 +143,17 @@ class ProfileView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         user = UserService.update_user(request.user, **serializer.validated_data)
-        return Response(UserSerializer(user).data)
+        # Сбрасываем закешированного по токенам пользователя
+        from apps.auth_app.cache import token_cache
+        token_cache.invalidate_user(user.id)
+        return Response(user_data(user))
 
     @login_required
     def delete(self, request):
         """Мягкое удаление аккаунта."""
         # Инвалидируем все сессии
-        from apps.auth_app.models import Session
-        Session.objects.filter(user=request.user).update(is_active=False)
+        from apps.auth_app.services import AuthService
+        AuthService.logout_all(request.user)
         
         # Мягкое удаление
         UserService.soft_delete(request.user)
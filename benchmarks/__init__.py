@@ -0,0 +1,35 @@
+"""
+Бенчмарки горячих путей.
+
+Запуск: python -m benchmarks.<модуль>
+По умолчанию используется config.settings_bench (SQLite), для замеров на
+PostgreSQL задайте DJANGO_SETTINGS_MODULE=config.settings.
+Результаты печатаются в stdout в виде JSON.
+"""
+import io
+import json
+import os
+import sys
+
+
+def setup():
+    """Настроить Django, применить миграции и заполнить тестовые данные."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings_bench')
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    call_command('seed_data', stdout=io.StringIO())
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def report(results):
+    json.dump(results, sys.stdout, indent=2, ensure_ascii=False, default=str)
+    sys.stdout.write('\n')
@@ -0,0 +1,118 @@
+"""
+Сравнение WSGI и ASGI путей при высокой конкурентности.
+
+WSGI: N потоков с django.test.Client (синхронный обработчик).
+ASGI: N корутин с django.test.AsyncClient (async middleware и
+представления из config.urls_asgi). Обработчики вызываются в
+процессе, сетевой сервер (gunicorn/uvicorn) в замер не входит.
+
+    python -m benchmarks.bench_asgi --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks import percentile, report, setup
+
+PATHS = ['/api/permissions/my/', '/api/users/profile/']
+
+
+def summarize(latencies, elapsed, errors):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else None,
+        'p50_ms': (percentile(latencies, 50) or 0) * 1000,
+        'p99_ms': (percentile(latencies, 99) or 0) * 1000,
+    }
+
+
+def run_wsgi(path, token, concurrency, total):
+    from django.db import connection
+    from django.test import Client
+
+    latencies = []
+    errors = [0]
+    counter = iter(range(total))
+    lock = threading.Lock()
+
+    def worker():
+        client = Client()
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            started = time.perf_counter()
+            response = client.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code != 200:
+                    errors[0] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def run_asgi(path, token, concurrency, total):
+    from django.test import AsyncClient, override_settings
+
+    latencies = []
+    errors = [0]
+    counter = iter(range(total))
+
+    async def worker():
+        client = AsyncClient()
+        headers = {'Authorization': f'Bearer {token}'}
+        while next(counter, None) is not None:
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors[0] += 1
+
+    async def main():
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    with override_settings(ROOT_URLCONF='config.urls_asgi'):
+        started = time.perf_counter()
+        asyncio.run(main())
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors[0])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    # Потокам и async ORM нужна общая БД, поэтому SQLite в памяти не подходит
+    if 'BENCH_DB_NAME' not in os.environ:
+        os.environ['BENCH_DB_NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    setup()
+
+    from apps.auth_app.services import AuthService
+
+    _, token = AuthService.login('manager@test.com', 'manager123')
+
+    output = {'concurrency': args.concurrency, 'requests': args.requests}
+    for path in PATHS:
+        output[path] = {
+            'wsgi': run_wsgi(path, token, args.concurrency, args.requests),
+            'asgi': run_asgi(path, token, args.concurrency, args.requests),
+        }
+    report(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Пиковая память воркера при выгрузке назначений ролей.
+
+Сравнивает GET /api/permissions/user-roles/?page_size=<все строки>
+(весь список в памяти) и ?export=stream (NDJSON) для разного числа строк;
+режим asgi_stream отдает тот же поток через ASGIHandler (config.urls_asgi),
+чтобы проверить, что под ASGI ответ не собирается в память целиком.
+Каждый замер идет в отдельном процессе, потому что пиковый RSS
+процесса (ru_maxrss) только растет. Результат - прирост пикового RSS
+над уровнем после заполнения БД.
+
+    python -m benchmarks.bench_export --rows 10000,50000,200000
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+from benchmarks import report, setup
+
+PAGE_SIZE = 10 ** 9
+
+
+def current_rss_kb() -> int:
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() // 1024
+
+
+def fill_user_roles(rows):
+    from apps.permissions.models import Role, UserRole
+    from apps.users.models import User
+
+    role = Role.objects.get(name='user')
+    batch = 5000
+    for start in range(0, rows, batch):
+        users = User.objects.bulk_create([
+            User(email=f'export{i}@bench.test', password_hash='-', first_name='Bench', last_name='Bench')
+            for i in range(start, min(start + batch, rows))
+        ])
+        UserRole.objects.bulk_create([UserRole(user=user, role=role) for user in users])
+
+
+async def asgi_get(path, query, token):
+    """GET через ASGIHandler. Возвращает (статус, байт тела)."""
+    from django.core.handlers.asgi import ASGIHandler
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'root_path': '',
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+    }
+    result = {'status': None, 'bytes': 0}
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Future()  # клиент не отключается
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            result['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            result['bytes'] += len(message.get('body', b''))
+
+    await ASGIHandler()(scope, receive, send)
+    return result['status'], result['bytes']
+
+
+def child(mode, rows):
+    from django.conf import settings
+    if mode.startswith('asgi'):
+        # Запросы ASGI идут из потоков sync_to_async, SQLite в памяти у каждого потока своя
+        os.environ['ROOT_URLCONF'] = 'config.urls_asgi'
+        if 'BENCH_DB_NAME' not in os.environ:
+            os.environ['BENCH_DB_NAME'] = tempfile.mkstemp(suffix='.sqlite3')[1]
+            atexit.register(os.remove, os.environ['BENCH_DB_NAME'])
+    setup()
+    settings.LIST_MAX_PAGE_SIZE = PAGE_SIZE
+
+    from django.test import Client
+    from apps.auth_app.services import AuthService
+
+    fill_user_roles(rows)
+    _, token = AuthService.login('admin@test.com', 'admin123')
+    client = Client()
+    query = f'page_size={PAGE_SIZE}' if mode == 'list' else 'export=stream'
+
+    baseline = current_rss_kb()
+    started = time.perf_counter()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        if mode.startswith('asgi'):
+            status, size = asyncio.run(asgi_get('/api/permissions/user-roles/', query, token))
+        else:
+            response = client.get(
+                f'/api/permissions/user-roles/?{query}', HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+            status, size = response.status_code, 0
+            if response.streaming:
+                for chunk in response.streaming_content:
+                    size += len(chunk)
+            else:
+                size = len(response.content)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    json.dump({
+        'status': status,
+        'bytes': size,
+        'seconds': elapsed,
+        'peak_rss_growth_mb': max(0, peak - baseline) / 1024,
+        'buffered_sync_iterator': any(
+            'synchronous iterators' in str(warning.message) for warning in caught
+        ),
+    }, sys.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', default='10000,50000')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    output = {}
+    for rows in map(int, args.rows.split(',')):
+        output[rows] = {}
+        for mode in ('list', 'stream', 'asgi_stream'):
+            result = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_export', '--child', mode, str(rows)],
+                capture_output=True, text=True, check=True,
+            )
+            output[rows][mode] = json.loads(result.stdout.strip().splitlines()[-1])
+    report(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Горячие пути аутентификации, прав и списков.
+
+Для каждого случая замеряет время вызова (среднее, p50, p99), число
+запросов к БД на вызов и память: пик выделений tracemalloc за один вызов
+и сколько осталось занято после всех прогонов. Память меряется отдельным
+проходом, чтобы трассировка не искажала время. Случаи «cold» перед каждым
+вызовом сбрасывают кеш процесса.
+
+    python -m benchmarks.bench_hot_paths --repeat 500 --output after.json
+    python -m benchmarks.bench_hot_paths --compare before.json
+
+С --compare к результату добавляется отношение времени и памяти и разница
+запросов относительно сохраненного прогона (отношение < 1 - быстрее).
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks import percentile, report, setup
+
+
+def measure(func, repeat):
+    from django.db import connection
+
+    func()  # прогрев
+
+    queries = [0]
+
+    def count(execute, sql, params, many, context):
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    timings = []
+    with connection.execute_wrapper(count):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        peaks = []
+        for _ in range(repeat):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'us_mean': sum(timings) / repeat * 1e6,
+        'us_p50': percentile(timings, 50) * 1e6,
+        'us_p99': percentile(timings, 99) * 1e6,
+        'queries': queries[0] / repeat,
+        'alloc_peak_bytes': sum(peaks) / repeat,
+        'retained_bytes': max(0, end - start),
+    }
+
+
+def build_cases():
+    from django.test import Client, RequestFactory
+    from apps.auth_app.cache import token_cache
+    from apps.auth_app.middleware import JWTAuthMiddleware
+    from apps.auth_app.services import AuthService
+    from apps.permissions.cache import permissions_cache
+    from apps.permissions.models import Permission
+    from apps.permissions.serializers import PERMISSION_VALUES, PermissionSerializer, permission_row
+    from apps.permissions.services import PermissionService
+    from apps.users.serializers import UserSerializer, user_data
+
+    _, token = AuthService.login('manager@test.com', 'manager123')
+    _, admin_token = AuthService.login('admin@test.com', 'admin123')
+    user = AuthService.get_user_by_token(token)
+    auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+    admin_auth = {'HTTP_AUTHORIZATION': f'Bearer {admin_token}'}
+    client = Client()
+    factory = RequestFactory()
+    middleware = JWTAuthMiddleware(lambda request: request.user.id)
+    check_body = {'checks': [
+        {'resource_code': code, 'action': action}
+        for code in ('products', 'orders', 'reports')
+        for action in ('read', 'create', 'update', 'delete')
+    ]}
+
+    def ok(response):
+        # Замер ответа с ошибкой ничего не говорит о горячем пути
+        if response.status_code >= 400:
+            raise RuntimeError(f'{response.status_code}: {response.content[:200]!r}')
+        return response
+
+    def cold(cache, func):
+        def call():
+            cache.clear()
+            return func()
+        return call
+
+    def get_user():
+        return AuthService.get_user_by_token(token)
+
+    def through_middleware():
+        return middleware(factory.get('/api/users/profile/', **auth))
+
+    def user_permissions():
+        return PermissionService.get_user_permissions(user)
+
+    return {
+        'auth.get_user_by_token': get_user,
+        'auth.get_user_by_token.cold': cold(token_cache, get_user),
+        'middleware.jwt_auth': through_middleware,
+        'middleware.jwt_auth.cold': cold(token_cache, through_middleware),
+        'permissions.check_permission': lambda: PermissionService.check_permission(
+            user, 'orders', 'update', True
+        ),
+        'permissions.get_user_permissions': user_permissions,
+        'permissions.get_user_permissions.cold': cold(permissions_cache, user_permissions),
+        'serializers.user.drf': lambda: UserSerializer(user).data,
+        'serializers.user.fast': lambda: user_data(user),
+        'serializers.rules.drf': lambda: PermissionSerializer(
+            Permission.objects.select_related('role', 'resource').order_by('id'), many=True
+        ).data,
+        'serializers.rules.fast': lambda: [
+            permission_row(row) for row in Permission.objects.order_by('id').values(*PERMISSION_VALUES)
+        ],
+        'e2e.profile': lambda: ok(client.get('/api/users/profile/', **auth)),
+        'e2e.my_permissions': lambda: ok(client.get('/api/permissions/my/', **auth)),
+        'e2e.permission_check': lambda: ok(client.post(
+            '/api/permissions/check/', check_body, content_type='application/json', **auth
+        )),
+        'e2e.products': lambda: ok(client.get('/api/business/products/', **auth)),
+        'e2e.rules': lambda: ok(client.get('/api/permissions/rules/', **admin_auth)),
+    }
+
+
+def compare(results, baseline):
+    changes = {}
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        changes[name] = {
+            'time_ratio': current['us_mean'] / before['us_mean'] if before['us_mean'] else None,
+            'queries_diff': current['queries'] - before['queries'],
+            'alloc_ratio': (
+                current['alloc_peak_bytes'] / before['alloc_peak_bytes']
+                if before['alloc_peak_bytes'] else None
+            ),
+        }
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--only', help='Подстрока имени случая, например e2e.')
+    parser.add_argument('--output', help='Сохранить результат в JSON-файл')
+    parser.add_argument('--compare', help='JSON-файл прошлого прогона для сравнения')
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+
+    results = {}
+    for name, func in build_cases().items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+
+    output = {'repeat': args.repeat, 'database': connection.vendor, 'results': results}
+    if args.compare:
+        with open(args.compare) as f:
+            output['compare'] = compare(results, json.load(f)['results'])
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+    report(output)
+
+
+if __name__ == '__main__':
+    main()
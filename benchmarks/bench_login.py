@@ -0,0 +1,102 @@
+"""
+Пропускная способность входа и регистрации при смешанной нагрузке.
+
+Несколько потоков долбят /api/auth/login/ и /api/users/register/,
+параллельно другие потоки читают дешевый /api/permissions/my/.
+Показывает, не голодают ли дешевые запросы при всплеске bcrypt.
+
+    python -m benchmarks.bench_login --duration 10 --login-threads 16
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+from benchmarks import percentile, report, setup
+
+
+def worker(kind, deadline, results, token=None):
+    from django.db import connection
+    from django.test import Client
+
+    client = Client()
+    latencies = []
+    statuses = Counter()
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if kind == 'login':
+            response = client.post('/api/auth/login/', {
+                'email': 'user@test.com', 'password': 'user123'
+            }, content_type='application/json')
+        elif kind == 'register':
+            password = uuid.uuid4().hex[:12]
+            response = client.post('/api/users/register/', {
+                'email': f'{uuid.uuid4().hex}@bench.test',
+                'password': password, 'password_confirm': password,
+                'first_name': 'Bench', 'last_name': 'Bench',
+            }, content_type='application/json')
+        else:
+            response = client.get(
+                '/api/permissions/my/', HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] += 1
+    connection.close()
+    results[kind]['latencies'].extend(latencies)
+    results[kind]['statuses'].update(statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--login-threads', type=int, default=8)
+    parser.add_argument('--register-threads', type=int, default=2)
+    parser.add_argument('--read-threads', type=int, default=4)
+    args = parser.parse_args()
+
+    # Потокам нужна общая БД, поэтому SQLite в памяти не подходит
+    if 'BENCH_DB_NAME' not in os.environ:
+        os.environ['BENCH_DB_NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    setup()
+
+    from apps.auth_app.services import AuthService
+    from apps.users.hashing import password_hasher
+
+    _, token = AuthService.login('manager@test.com', 'manager123')
+
+    results = {
+        kind: {'latencies': [], 'statuses': Counter()}
+        for kind in ('login', 'register', 'read')
+    }
+    deadline = time.perf_counter() + args.duration
+    threads = (
+        [threading.Thread(target=worker, args=('login', deadline, results))
+         for _ in range(args.login_threads)]
+        + [threading.Thread(target=worker, args=('register', deadline, results))
+           for _ in range(args.register_threads)]
+        + [threading.Thread(target=worker, args=('read', deadline, results, token))
+           for _ in range(args.read_threads)]
+    )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    output = {'duration': args.duration, 'hasher': password_hasher.stats()}
+    for kind, data in results.items():
+        latencies = data['latencies']
+        output[kind] = {
+            'requests': len(latencies),
+            'rps': len(latencies) / args.duration,
+            'statuses': dict(data['statuses']),
+            'p50_ms': (percentile(latencies, 50) or 0) * 1000,
+            'p99_ms': (percentile(latencies, 99) or 0) * 1000,
+        }
+    report(output)
+
+
+if __name__ == '__main__':
+    main()
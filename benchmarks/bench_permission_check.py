@@ -0,0 +1,88 @@
+"""
+Стоимость пакетной проверки прав в пересчете на один элемент.
+
+Замеряет PermissionService.check_many и POST /api/permissions/check/
+для разных размеров пакета; для сравнения - те же проверки по одной
+через check_permission.
+
+    python -m benchmarks.bench_permission_check --repeat 200
+"""
+import argparse
+import itertools
+import time
+
+from benchmarks import report, setup
+
+
+def make_checks(size):
+    combos = itertools.cycle(itertools.product(
+        ['products', 'orders', 'reports'],
+        ['read', 'create', 'update', 'delete'],
+        [False, True],
+    ))
+    return list(itertools.islice(combos, size))
+
+
+def measure(func, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    func()  # прогрев
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed = time.perf_counter() - started
+    return elapsed / repeat, len(queries) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--sizes', default='1,10,50,200')
+    args = parser.parse_args()
+
+    setup()
+
+    from django.test import Client
+    from apps.auth_app.services import AuthService
+    from apps.permissions.services import PermissionService
+
+    user, token = AuthService.login('manager@test.com', 'manager123')
+    user = AuthService.get_user_by_token(token)
+    client = Client()
+
+    output = {'repeat': args.repeat, 'sizes': {}}
+    for size in map(int, args.sizes.split(',')):
+        checks = make_checks(size)
+        body = {'checks': [
+            {'resource_code': r, 'action': a, 'is_owner': o} for r, a, o in checks
+        ]}
+
+        batch, batch_queries = measure(
+            lambda: PermissionService.check_many(user, checks), args.repeat
+        )
+        single, single_queries = measure(
+            lambda: [PermissionService.check_permission(user, *c) for c in checks], args.repeat
+        )
+        endpoint, endpoint_queries = measure(
+            lambda: client.post(
+                '/api/permissions/check/', body,
+                content_type='application/json', HTTP_AUTHORIZATION=f'Bearer {token}'
+            ),
+            args.repeat,
+        )
+        output['sizes'][size] = {
+            'check_many_us_per_item': batch / size * 1e6,
+            'check_many_queries': batch_queries,
+            'check_permission_us_per_item': single / size * 1e6,
+            'check_permission_queries': single_queries,
+            'endpoint_us_per_item': endpoint / size * 1e6,
+            'endpoint_us_per_request': endpoint * 1e6,
+            'endpoint_queries': endpoint_queries,
+        }
+    report(output)
+
+
+if __name__ == '__main__':
+    main()
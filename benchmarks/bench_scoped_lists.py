@@ -0,0 +1,75 @@
+"""
+Размер ответа и задержка списка заказов в зависимости от области чтения.
+
+manager читает все заказы (can_read_all), user - только свои (can_read).
+Заказы генерируются так, что пользователю принадлежит --own-share от всех.
+
+    python -m benchmarks.bench_scoped_lists --rows 100000 --own-share 0.01
+"""
+import argparse
+import time
+
+from benchmarks import percentile, report, setup
+
+
+def fill_orders(rows, owner, others, own_share):
+    from apps.business.models import Order, Product
+
+    product = Product.objects.first()
+    step = max(1, round(1 / own_share)) if own_share else rows + 1
+    Order.objects.bulk_create(
+        (
+            Order(
+                product=product, quantity=1,
+                owner=owner if i % step == 0 else others[i % len(others)],
+            )
+            for i in range(1, rows + 1)
+        ),
+        batch_size=5000,
+    )
+
+
+def measure(client, token, repeat):
+    latencies = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get('/api/business/orders/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        latencies.append(time.perf_counter() - started)
+        size = len(response.content)
+    return {
+        'status': response.status_code,
+        'response_bytes': size,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--own-share', type=float, default=0.01)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.test import Client
+    from apps.auth_app.services import AuthService
+
+    user, user_token = AuthService.login('user@test.com', 'user123')
+    manager, manager_token = AuthService.login('manager@test.com', 'manager123')
+    admin, _ = AuthService.login('admin@test.com', 'admin123')
+    fill_orders(args.rows, user, [manager, admin], args.own_share)
+
+    client = Client()
+    report({
+        'rows': args.rows,
+        'own_share': args.own_share,
+        'all': measure(client, manager_token, args.repeat),
+        'own': measure(client, user_token, args.repeat),
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Быстрые сериализаторы против DRF ModelSerializer.
+
+Для пользователей, правил, назначений ролей и ролей замеряет выборку +
+сериализацию --rows объектов обоими путями (время в пересчете на 10k
+объектов и число запросов) и сверяет, что JSONRenderer выдает для них
+одинаковые байты. При расхождении выход с кодом 1.
+
+    python -m benchmarks.bench_serializers --rows 10000
+"""
+import argparse
+import sys
+import time
+
+from benchmarks import report, setup
+
+BATCH = 1000
+
+
+def fill(rows):
+    from apps.permissions.models import ACTION_BITS, Permission, Resource, Role, UserRole
+    from apps.users.models import User
+
+    roles = Role.objects.bulk_create([
+        Role(name=f'bench-role-{i}', description=f'Роль {i}') for i in range(rows)
+    ])
+    resources = Resource.objects.bulk_create([
+        Resource(code=f'bench-{i}', name=f'Ресурс {i}') for i in range(rows // 3 + 1)
+    ])
+    full = sum(ACTION_BITS.values())
+    Permission.objects.bulk_create([
+        Permission(role=roles[j], resource=resource, actions=(i * 7 + j) % (full + 1))
+        for i, resource in enumerate(resources) for j in range(3)
+    ][:rows], batch_size=BATCH)
+    users = User.objects.bulk_create([
+        User(
+            email=f'serial{i}@bench.test', password_hash='-',
+            first_name='Имя', last_name=f'Фамилия {i}',
+            patronymic='Отчество' if i % 2 else None,
+        )
+        for i in range(rows)
+    ], batch_size=BATCH)
+    UserRole.objects.bulk_create(
+        [UserRole(user=user, role=roles[i % len(roles)]) for i, user in enumerate(users)],
+        batch_size=BATCH,
+    )
+
+
+def measure(func, repeat=3):
+    """Лучшее время из repeat прогонов и число запросов за прогон."""
+    from django.db import connection
+
+    queries = [0]
+
+    def count(execute, sql, params, many, context):
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    best = None
+    with connection.execute_wrapper(count):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    return data, best, queries[0] // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    setup()
+    fill(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+    from apps.permissions.models import Permission, Role, UserRole
+    from apps.permissions.serializers import (
+        PermissionSerializer, RoleSerializer, UserRoleSerializer,
+        PERMISSION_VALUES, ROLE_VALUES, USER_ROLE_VALUES, permission_row, user_role_row,
+    )
+    from apps.users.models import User
+    from apps.users.serializers import UserSerializer, user_data
+    from apps.users.services import UserService
+
+    def load_users():
+        users = list(User.objects.order_by('email'))
+        for start in range(0, len(users), BATCH):
+            UserService.load_roles(users[start:start + BATCH])
+        return [user_data(user) for user in users]
+
+    cases = {
+        'user': (
+            lambda: UserSerializer(User.objects.order_by('email'), many=True).data,
+            load_users,
+        ),
+        'permission': (
+            lambda: PermissionSerializer(
+                Permission.objects.select_related('role', 'resource').order_by('id'), many=True
+            ).data,
+            lambda: [permission_row(row) for row in
+                     Permission.objects.order_by('id').values(*PERMISSION_VALUES)],
+        ),
+        'user_role': (
+            lambda: UserRoleSerializer(
+                UserRole.objects.select_related('user', 'role').order_by('id'), many=True
+            ).data,
+            lambda: [user_role_row(row) for row in
+                     UserRole.objects.order_by('id').values(*USER_ROLE_VALUES)],
+        ),
+        'role': (
+            lambda: RoleSerializer(Role.objects.order_by('id'), many=True).data,
+            lambda: list(Role.objects.order_by('id').values(*ROLE_VALUES)),
+        ),
+    }
+
+    renderer = JSONRenderer()
+    output = {'rows': args.rows, 'parity': {}}
+    for name, (drf, fast) in cases.items():
+        drf_data, drf_seconds, drf_queries = measure(drf)
+        fast_data, fast_seconds, fast_queries = measure(fast)
+        per_10k = 10000 / max(1, len(drf_data))
+        output[name] = {
+            'objects': len(drf_data),
+            'drf_ms_per_10k': drf_seconds * per_10k * 1000,
+            'drf_queries': drf_queries,
+            'fast_ms_per_10k': fast_seconds * per_10k * 1000,
+            'fast_queries': fast_queries,
+            'speedup': drf_seconds / fast_seconds if fast_seconds else None,
+        }
+        output['parity'][name] = renderer.render(drf_data) == renderer.render(fast_data)
+    report(output)
+
+    if not all(output['parity'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
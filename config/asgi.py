@@ -0,0 +1,12 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('ROOT_URLCONF', 'config.urls_asgi')
+application = get_asgi_application()
+
+# Фоновая очистка сессий - только в веб-процессах и только если включена
+from django.conf import settings  # noqa: E402
+from apps.auth_app.sweeper import session_sweeper  # noqa: E402
+
+session_sweeper.start(settings.SESSION_SWEEP_INTERVAL)
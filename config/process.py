@@ -0,0 +1,21 @@
+"""
+Роль текущего процесса для фоновой работы, запускаемой из AppConfig.ready().
+"""
+import os
+import sys
+
+# Имена, под которыми запускаются команды Django
+COMMAND_SCRIPTS = {'manage.py', 'django-admin', 'django-admin.py'}
+
+
+def serves_requests() -> bool:
+    """
+    Процесс обслуживает запросы (gunicorn, uvicorn, runserver), а не
+    выполняет команду manage.py или django-admin. У runserver с
+    автоперезагрузкой запросы обслуживает дочерний процесс с RUN_MAIN=true.
+    """
+    if os.path.basename(sys.argv[0]) not in COMMAND_SCRIPTS:
+        return True
+    if len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return False
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in sys.argv
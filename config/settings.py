@@ -16,15 +16,20 @@ INSTALLED_APPS = [
     'apps.auth_app',
     'apps.permissions',
     'apps.business',
+    'apps.monitoring',
 ]
 
 MIDDLEWARE = [
+    'apps.monitoring.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.common.CommonMiddleware',
     'apps.auth_app.middleware.JWTAuthMiddleware',
 ]
 
-ROOT_URLCONF = 'config.urls'
+# config/asgi.py подставляет config.urls_asgi с async-представлениями
+ROOT_URLCONF = os.environ.get('ROOT_URLCONF', 'config.urls')
+# runserver тоже загружает config/wsgi.py (там стартует фоновая очистка сессий)
+WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
@@ -41,11 +46,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.monitoring.renderers.TimedJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'apps.auth_app.authentication.JWTAuthentication',
+    ],
     'UNAUTHENTICATED_USER': None,
 }
 
@@ -53,3 +61,68 @@ REST_FRAMEWORK = {
 JWT_SECRET = os.environ.get('JWT_SECRET', SECRET_KEY)
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
+
+# Кеш токенов внутри процесса (token -> user)
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', 10000))
+AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', 60))
+# Как часто кеш сверяется с отозванными сессиями и измененными пользователями, сек
+AUTH_CACHE_REFRESH_SECONDS = float(os.environ.get('AUTH_CACHE_REFRESH_SECONDS', 1))
+
+# Проверка токенов без обращения к таблице сессий.
+# Отзыв токенов вступает в силу не позже чем через REVOCATION_REFRESH_SECONDS.
+JWT_STATELESS = os.environ.get('JWT_STATELESS', 'False') == 'True'
+REVOCATION_FILTER_CAPACITY = int(os.environ.get('REVOCATION_FILTER_CAPACITY', 100000))
+REVOCATION_FILTER_ERROR_RATE = float(os.environ.get('REVOCATION_FILTER_ERROR_RATE', 0.001))
+REVOCATION_REFRESH_SECONDS = int(os.environ.get('REVOCATION_REFRESH_SECONDS', 5))
+
+# Пул потоков для bcrypt: число потоков и максимальная очередь ожидания
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 16))
+PASSWORD_HASH_RETRY_AFTER = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER', 1))
+
+# Очистка сессий (manage.py cleanup_sessions или фоновый поток)
+SESSION_RETENTION_DAYS = float(os.environ.get('SESSION_RETENTION_DAYS', 7))
+SESSION_SWEEP_BATCH_SIZE = int(os.environ.get('SESSION_SWEEP_BATCH_SIZE', 1000))
+SESSION_SWEEP_PAUSE = float(os.environ.get('SESSION_SWEEP_PAUSE', 0.1))
+SESSION_SWEEP_INTERVAL = int(os.environ.get('SESSION_SWEEP_INTERVAL', 0))  # 0 - выключено
+
+# Прогрев процесса в AppConfig.ready (включать для веб-процессов)
+WARMUP_ON_STARTUP = os.environ.get('WARMUP_ON_STARTUP', 'False') == 'True'
+
+# Как часто воркер сверяет версии правил и списков, сек
+PERMISSION_VERSION_CHECK_SECONDS = float(os.environ.get('PERMISSION_VERSION_CHECK_SECONDS', 1))
+PERMISSIONS_CACHE_SIZE = int(os.environ.get('PERMISSIONS_CACHE_SIZE', 10000))
+PERMISSION_CHECK_MAX_ITEMS = int(os.environ.get('PERMISSION_CHECK_MAX_ITEMS', 200))
+
+# Постраничная выдача списков (курсор по id): размер страницы по умолчанию и максимум
+LIST_PAGE_SIZE = int(os.environ.get('LIST_PAGE_SIZE', 100))
+LIST_MAX_PAGE_SIZE = int(os.environ.get('LIST_MAX_PAGE_SIZE', 1000))
+
+# Потоковая выгрузка (?export=stream): строк на одно чтение из БД и одну пачку ответа
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
+# Массовое назначение и снятие ролей: максимум пар в запросе и размер пачки запросов к БД
+ROLE_BULK_MAX_ITEMS = int(os.environ.get('ROLE_BULK_MAX_ITEMS', 10000))
+ROLE_BULK_BATCH_SIZE = int(os.environ.get('ROLE_BULK_BATCH_SIZE', 1000))
+
+# Импорт пользователей (manage.py import_users, POST /api/users/import/)
+USER_IMPORT_BATCH_SIZE = int(os.environ.get('USER_IMPORT_BATCH_SIZE', 1000))
+USER_IMPORT_WORKERS = int(os.environ.get('USER_IMPORT_WORKERS', os.cpu_count() or 2))
+# Ограничения POST /api/users/import/ (хеширование идет внутри запроса)
+USER_IMPORT_MAX_ROWS = int(os.environ.get('USER_IMPORT_MAX_ROWS', 200))
+USER_IMPORT_MAX_UPLOAD_BYTES = int(os.environ.get('USER_IMPORT_MAX_UPLOAD_BYTES', 1024 * 1024))
+
+# Замер запросов: этапы и БД в заголовке Server-Timing, гистограммы по маршрутам на /metrics
+REQUEST_TIMING = os.environ.get('REQUEST_TIMING', 'True') == 'True'
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', 'True') == 'True'
+REQUEST_TIMING_BUCKETS = tuple(
+    float(bound) for bound in
+    os.environ.get('REQUEST_TIMING_BUCKETS', '0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10').split(',')
+)
+# Доступ к /metrics: адреса и сети клиента (через запятую) и/или токен
+# в заголовке Authorization: Bearer <METRICS_TOKEN>
+METRICS_ALLOWED_IPS = [
+    network.strip() for network in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+    if network.strip()
+]
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
@@ -0,0 +1,13 @@
+from .settings import *  # noqa: F401,F403
+
+# Локальная SQLite для бенчмарков. BENCH_DB_NAME - путь к файлу,
+# по умолчанию БД в памяти.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BENCH_DB_NAME', ':memory:'),
+        'OPTIONS': {'timeout': 30},
+    }
+}
+
+DEBUG = False
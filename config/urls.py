@@ -5,4 +5,5 @@ urlpatterns = [
     path('api/users/', include('apps.users.urls')),
     path('api/permissions/', include('apps.permissions.urls')),
     path('api/business/', include('apps.business.urls')),
+    path('', include('apps.monitoring.urls')),
 ]
@@ -0,0 +1,18 @@
+"""
+URL-схема для ASGI: пути аутентификации, профиля и проверки прав
+обслуживают async-представления, остальные - синхронные из config.urls.
+"""
+from django.urls import path, include
+
+from apps.auth_app.async_views import LoginAsyncView, LogoutAsyncView
+from apps.users.async_views import RegisterAsyncView, ProfileAsyncView
+from apps.permissions.async_views import MyPermissionsAsyncView
+
+urlpatterns = [
+    path('api/auth/login/', LoginAsyncView.as_view(), name='login'),
+    path('api/auth/logout/', LogoutAsyncView.as_view(), name='logout'),
+    path('api/users/register/', RegisterAsyncView.as_view(), name='register'),
+    path('api/users/profile/', ProfileAsyncView.as_view(), name='profile'),
+    path('api/permissions/my/', MyPermissionsAsyncView.as_view(), name='my-permissions'),
+    path('', include('config.urls')),
+]
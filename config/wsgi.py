@@ -3,3 +3,9 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_wsgi_application()
+
+# Фоновая очистка сессий - только в веб-процессах и только если включена
+from django.conf import settings  # noqa: E402
+from apps.auth_app.sweeper import session_sweeper  # noqa: E402
+
+session_sweeper.start(settings.SESSION_SWEEP_INTERVAL)